@@ -38,16 +38,13 @@ def train_lgbm(data_file: str, model_out: str):
     print(f"Features generated: {X.columns.tolist()}")
 
     # Define Target: 1 if the 'close' price 5 periods from now is higher than current 'close'
-    # Shift(-5) pulls the future row up to the current index
+    # (0 for DOWN or flat).  Compared on the raw array, so no shifted copy
+    # of the column is built; the last 'target_horizon' rows have no future
+    # to predict and are dropped.
     target_horizon = 5
-    future_close = X['close'].shift(-target_horizon)
-    
-    # 1 for UP, 0 for DOWN (or flat)
-    y = (future_close > X['close']).astype(int)
-    
-    # Drop the last 'target_horizon' rows because they don't have a future to predict
+    close = X['close'].to_numpy()
+    y = np.greater(close[target_horizon:], close[:-target_horizon]).astype(np.int8)
     X = X.iloc[:-target_horizon]
-    y = y.iloc[:-target_horizon]
     
     # Optional: We can drop open/high/low/close/volume if we only want indicators,
     # but the current feature engineer keeps them. LightGBM handles them fine.
@@ -56,10 +53,13 @@ def train_lgbm(data_file: str, model_out: str):
     
     # Split chronologically (do not shuffle time series!)
     split_idx = int(len(X) * 0.8)
-    X_train, X_test = X.iloc[:split_idx], X.iloc[split_idx:]
-    y_train, y_test = y.iloc[:split_idx], y.iloc[split_idx:]
+    # One float64 matrix, split by views; column names go in explicitly.
+    feature_names = X.columns.tolist()
+    X = X.to_numpy(dtype=np.float64)
+    X_train, X_test = X[:split_idx], X[split_idx:]
+    y_train, y_test = y[:split_idx], y[split_idx:]
     
-    train_data = lgb.Dataset(X_train, label=y_train)
+    train_data = lgb.Dataset(X_train, label=y_train, feature_name=feature_names)
     test_data = lgb.Dataset(X_test, label=y_test, reference=train_data)
     
     params = {
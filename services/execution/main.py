@@ -1,14 +1,16 @@
 import asyncio
 import datetime
+import heapq
 import json
 import logging
+import logging.handlers
 import math
 import os
+import queue
 import sys
 import uuid
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 
-import redis.asyncio as redis
 from dotenv import load_dotenv
 
 # New Core Imports
@@ -30,14 +32,15 @@ from schemas import (
     SCHEMA_VERSION,
 )
 from health import run_health_server, set_ready
+from redis_client import get_redis
 
 load_dotenv()
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
+# Log records are handed to a queue and written to stdout by a background
+# listener thread, so console I/O never blocks the event loop.  Logging is
+# configured and the listener started in main(), so importing this module
+# has no side effects.
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
 logger = logging.getLogger("TitanExecutionService")
 
 # Initialize Engines
@@ -45,22 +48,54 @@ validator = OrderValidator()
 slippage_model = SlippageModel()
 latency_sim = LatencySimulator()
 
+# Number of portfolios included in each leaderboard broadcast.  The full
+# ranking is still written to Redis under _PORTFOLIO_SNAPSHOT_KEY on demand.
+_LEADERBOARD_TOP_K = int(os.getenv("PAPER_LEADERBOARD_TOP_K", "20"))
+_PORTFOLIO_SNAPSHOT_KEY = "paper_portfolio_snapshot"
+
+# Canonical order sides.  Producers already send "buy"/"sell" (risk) or the
+# uppercase form, so a dict hit avoids allocating via str.upper() per request.
+_SIDE_MAP = {
+    "buy": "BUY", "sell": "SELL", "hold": "HOLD",
+    "BUY": "BUY", "SELL": "SELL", "HOLD": "HOLD",
+}
+
+
+def _normalize_side(raw: str) -> str:
+    """Return the uppercase order side, using the precomputed map when possible."""
+    return _SIDE_MAP.get(raw) or raw.upper()
+
 # --- Helper Functions for Paper Execution ---
 
-async def simulate_fill(execution_req: Dict, current_price: float, manager: PortfolioManager) -> Optional[Dict]:
+async def simulate_fill(
+    execution_req: Union[ExecutionRequestEvent, Dict],
+    current_price: float,
+    manager: PortfolioManager,
+) -> Optional[Dict]:
     """
     Simulates a trade execution for paper mode.
     Expects an execution_requests payload (risk-approved) with pre-calculated qty.
     Returns a Fill Event dictionary if successful, None otherwise.
+
+    The paper loop passes the already-validated ExecutionRequestEvent so the
+    fixed schema is parsed exactly once per message; raw dicts are validated
+    here through the same schema and rejected if they do not conform.
     """
-    model_id = execution_req.get("model_id", "default_model")
+    if not isinstance(execution_req, ExecutionRequestEvent):
+        execution_req = validate_and_log(
+            ExecutionRequestEvent, execution_req, context="execution:simulate_fill"
+        )
+        if execution_req is None:
+            return None
+
+    model_id = execution_req.model_id
     # Risk service publishes side as lowercase "buy"/"sell"
-    side = execution_req.get("side", "").upper()
-    symbol = execution_req.get("symbol")
+    side = _normalize_side(execution_req.side)
+    symbol = execution_req.symbol
     # Use risk-calculated qty; qty is pre-sized by RiskGuardian
-    qty = int(execution_req.get("qty", 0))
+    qty = execution_req.qty
     # Use current market price; execution_requests may not include price
-    decision_price = float(execution_req.get("price") or current_price or 0.0)
+    decision_price = float(execution_req.price or current_price or 0.0)
 
     # Guard against NaN, infinity, or zero/negative prices that would corrupt portfolio state.
     if not (math.isfinite(decision_price) and decision_price > 0):
@@ -110,25 +145,59 @@ async def simulate_fill(execution_req: Dict, current_price: float, manager: Port
         "status": "FILLED",
         "mode": "paper",
         "slippage": round(executed_price - decision_price, 4),
-        "explanation": execution_req.get("explanation", [])
+        "explanation": execution_req.explanation
     }
 
-async def publish_portfolios(redis_client, manager: PortfolioManager, current_prices: Dict[str, float] = None):
-    """Publish leaderboard/portfolio summaries to Redis."""
+async def publish_portfolios(
+    redis_client,
+    manager: PortfolioManager,
+    current_prices: Dict[str, float] = None,
+    top_k: int = _LEADERBOARD_TOP_K,
+):
+    """
+    Publish leaderboard/portfolio summaries to Redis.
+
+    Only the top_k portfolios by equity are broadcast; the full unsorted list
+    is stored under the paper_portfolio_snapshot key for on-demand readers.
+    """
     portfolios = manager.get_all_portfolios(current_prices)
-    # Sort by equity (descending)
-    portfolios.sort(key=lambda x: x['equity'], reverse=True)
-    
+    # Top-K by equity (descending) — O(N log K) instead of a full sort
+    top = heapq.nlargest(top_k, portfolios, key=lambda x: x['equity'])
+
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
     payload = {
-        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-        "best_model": portfolios[0]["model_id"] if portfolios else None,
-        "models": portfolios,
+        "timestamp": timestamp,
+        "best_model": top[0]["model_id"] if top else None,
+        "models": top,
         "mode": "paper",
     }
     await redis_client.publish("paper_portfolio_updates", json.dumps(payload))
+    await redis_client.set(
+        _PORTFOLIO_SNAPSHOT_KEY,
+        json.dumps({"timestamp": timestamp, "models": portfolios, "mode": "paper"}),
+    )
 
 # --- Main Execution Loops ---
 
+async def _consume_channel(redis_client, channel: str, handler, context: str) -> None:
+    """
+    Consume a single Redis channel on its own pubsub connection.
+
+    Each channel gets an independent subscription and task so a burst on one
+    (e.g. market_data) can never queue ahead of another (e.g. execution_requests).
+    """
+    pubsub = redis_client.pubsub()
+    await pubsub.subscribe(channel)
+
+    async for message in pubsub.listen():
+        try:
+            if message.get("type") != "message":
+                continue
+            await handler(json.loads(message["data"]))
+        except Exception as exc:
+            logger.error("Error in %s [%s]: %s", context, channel, exc)
+
+
 async def run_live_execution(redis_client):
     """
     Live execution loop — connects Titan ML signals to real Alpaca orders.
@@ -142,6 +211,9 @@ async def run_live_execution(redis_client):
            if daily drawdown exceeds CIRCUIT_BREAKER_DRAWDOWN_PCT.
         6. Activate manual-approval mode if ROLLBACK_MIN_SHARPE threshold
            is monitored and falls below the configured floor.
+
+    market_data and execution_requests are consumed by independent tasks so
+    order latency does not depend on market-data burst size.
     """
     logger.info("Starting LIVE execution engine...")
 
@@ -172,7 +244,7 @@ async def run_live_execution(redis_client):
     try:
         connector = TitanAlpacaConnector.get_instance()
     except ValueError as exc:
-        logger.error(f"Cannot start live execution — connector init failed: {exc}")
+        logger.error("Cannot start live execution — connector init failed: %s", exc)
         return
 
     # --- Initialise audit logger and wire up Redis ---
@@ -185,127 +257,120 @@ async def run_live_execution(redis_client):
     if starting_equity <= 0:
         logger.error("Could not retrieve starting equity from Alpaca. Aborting live mode.")
         return
-    logger.info(f"Starting equity: ${starting_equity:,.2f}")
+    logger.info("Starting equity: $%.2f", starting_equity)
 
     last_account_poll = 0.0
     current_prices: Dict[str, float] = {}
+    loop = asyncio.get_running_loop()
+
+    # ---- Market data: keep price cache fresh ----
+    async def on_market_data(payload: Dict) -> None:
+        nonlocal last_account_poll
+        if payload.get("type") == "trade":
+            current_prices[payload["symbol"]] = float(payload["price"])
+
+        # Periodic account poll → circuit breaker check
+        now = loop.time()
+        if (now - last_account_poll) < account_poll_interval:
+            return
+        last_account_poll = now
+        acct = connector.get_account()
+        if not acct:
+            return
+
+        equity = acct.get("equity", starting_equity)
+        unrealized_pl = acct.get("unrealized_pl", 0.0)
+        daily_return = unrealized_pl / starting_equity if starting_equity > 0 else 0.0
+
+        logger.info(
+            "Account poll — equity=$%.2f daily_pnl=$%+.2f (%+.2f%%)",
+            equity, unrealized_pl, daily_return * 100,
+        )
 
-    # --- Subscribe to channels — only risk-approved requests, never raw trade_signals ---
-    pubsub = redis_client.pubsub()
-    await pubsub.subscribe("execution_requests", "market_data")
-    logger.info("Live execution subscribed to [execution_requests, market_data].")
+        # --- Circuit breaker: drawdown limit ---
+        if daily_return <= -circuit_breaker_drawdown and not connector.is_blocked:
+            trigger_msg = (
+                f"Daily drawdown {daily_return:.2%} exceeded limit "
+                f"-{circuit_breaker_drawdown:.2%}"
+            )
+            logger.critical(trigger_msg)
+            connector.activate_kill_switch()
+            connector.liquidate_all()
+            await audit.log_kill_switch(
+                trigger=trigger_msg,
+                drawdown_pct=daily_return,
+                equity=equity,
+                model_version=model_version,
+            )
+
+    # ---- Risk-approved execution request: execute via Alpaca ----
+    async def on_execution_request(payload: Dict) -> None:
+        exec_req = validate_and_log(
+            ExecutionRequestEvent, payload, context="execution:live:execution_requests"
+        )
+        if exec_req is None:
+            return
+
+        model_id = exec_req.model_id
+        symbol = exec_req.symbol
+        signal_str = _normalize_side(exec_req.side)  # risk sends "buy"/"sell"
+        confidence = exec_req.confidence
+        explanation = exec_req.explanation
+        price = current_prices.get(symbol, exec_req.price or 0.0)
+
+        logger.info(
+            "Signal received [%s]: %s %s conf=%.2f%% price=%s",
+            model_id, signal_str, symbol, confidence * 100, price,
+        )
 
-    async for message in pubsub.listen():
-        try:
-            if message.get("type") != "message":
-                continue
+        # 1. Audit the raw signal
+        await audit.log_signal(
+            model_id=model_id,
+            model_version=model_version,
+            symbol=symbol,
+            signal=signal_str,
+            confidence=confidence,
+            price=price,
+            explanation=explanation,
+        )
 
-            channel = message.get("channel", b"")
-            if isinstance(channel, bytes):
-                channel = channel.decode("utf-8")
-
-            payload = json.loads(message["data"])
-            now = asyncio.get_running_loop().time()
-
-            # ---- Market data: keep price cache fresh ----
-            if channel == "market_data":
-                if payload.get("type") == "trade":
-                    current_prices[payload["symbol"]] = float(payload["price"])
-
-                # Periodic account poll → circuit breaker check
-                if (now - last_account_poll) >= account_poll_interval:
-                    last_account_poll = now
-                    acct = connector.get_account()
-                    if acct:
-                        equity = acct.get("equity", starting_equity)
-                        unrealized_pl = acct.get("unrealized_pl", 0.0)
-                        daily_return = unrealized_pl / starting_equity if starting_equity > 0 else 0.0
-
-                        logger.info(
-                            f"Account poll — equity=${equity:,.2f} "
-                            f"daily_pnl=${unrealized_pl:+,.2f} ({daily_return:+.2%})"
-                        )
-
-                        # --- Circuit breaker: drawdown limit ---
-                        if daily_return <= -circuit_breaker_drawdown and not connector.is_blocked:
-                            trigger_msg = (
-                                f"Daily drawdown {daily_return:.2%} exceeded limit "
-                                f"-{circuit_breaker_drawdown:.2%}"
-                            )
-                            logger.critical(trigger_msg)
-                            connector.activate_kill_switch()
-                            connector.liquidate_all()
-                            await audit.log_kill_switch(
-                                trigger=trigger_msg,
-                                drawdown_pct=daily_return,
-                                equity=equity,
-                                model_version=model_version,
-                            )
-
-            # ---- Risk-approved execution request: execute via Alpaca ----
-            elif channel == "execution_requests":
-                exec_req = validate_and_log(
-                    ExecutionRequestEvent, payload, context="execution:live:execution_requests"
-                )
-                if exec_req is None:
-                    continue
-
-                model_id = exec_req.model_id
-                symbol = exec_req.symbol
-                signal_str = exec_req.side.upper()  # risk sends "buy"/"sell"
-                confidence = exec_req.confidence
-                explanation = exec_req.explanation
-                price = current_prices.get(symbol, exec_req.price or 0.0)
-
-                logger.info(
-                    f"Signal received [{model_id}]: {signal_str} {symbol} "
-                    f"conf={confidence:.2%} price={price}"
-                )
-
-                # 1. Audit the raw signal
-                await audit.log_signal(
-                    model_id=model_id,
-                    model_version=model_version,
-                    symbol=symbol,
-                    signal=signal_str,
-                    confidence=confidence,
-                    price=price,
-                    explanation=explanation,
-                )
-
-                # 2. Execute (connector handles all gates internally)
-                result = connector.execute_signal(
-                    symbol=symbol,
-                    signal=signal_str,
-                    confidence=confidence,
-                    model_id=model_id,
-                    price=price,
-                    model_version=model_version,
-                )
-
-                # 3. Audit the order if one was submitted
-                if result:
-                    await audit.log_order(
-                        model_id=result["model_id"],
-                        model_version=result["model_version"],
-                        symbol=result["symbol"],
-                        side=result["side"],
-                        qty=result["qty"],
-                        price=result["price_at_signal"],
-                        confidence=result["confidence"],
-                        order_id=result["order_id"],
-                        status=result["status"],
-                        mode=result["mode"],
-                    )
-                    # Publish fill-like event for dashboard compatibility
-                    await redis_client.publish("execution_filled", json.dumps({
-                        **result,
-                        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-                        "mode": "live",
-                    }))
+        # 2. Execute (connector handles all gates internally)
+        result = connector.execute_signal(
+            symbol=symbol,
+            signal=signal_str,
+            confidence=confidence,
+            model_id=model_id,
+            price=price,
+            model_version=model_version,
+        )
 
-        except Exception as exc:
-            logger.error(f"Error in live execution loop: {exc}")
+        # 3. Audit the order if one was submitted
+        if result:
+            await audit.log_order(
+                model_id=result["model_id"],
+                model_version=result["model_version"],
+                symbol=result["symbol"],
+                side=result["side"],
+                qty=result["qty"],
+                price=result["price_at_signal"],
+                confidence=result["confidence"],
+                order_id=result["order_id"],
+                status=result["status"],
+                mode=result["mode"],
+            )
+            # Publish fill-like event for dashboard compatibility
+            await redis_client.publish("execution_filled", json.dumps({
+                **result,
+                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "mode": "live",
+            }))
+
+    # --- Subscribe to channels — only risk-approved requests, never raw trade_signals ---
+    logger.info("Live execution subscribed to [execution_requests, market_data].")
+    await asyncio.gather(
+        _consume_channel(redis_client, "execution_requests", on_execution_request, "live execution loop"),
+        _consume_channel(redis_client, "market_data", on_market_data, "live execution loop"),
+    )
 
 async def run_paper_execution(redis_client):
     manager = PortfolioManager()
@@ -313,118 +378,128 @@ async def run_paper_execution(redis_client):
     # Configuration
     starting_cash = float(os.getenv("PAPER_STARTING_CASH", "100000"))
     publish_interval = float(os.getenv("PAPER_PORTFOLIO_PUBLISH_SECONDS", "2"))
-    
-    # Redis Channels — only consume risk-approved execution requests, never raw trade_signals
-    pubsub = redis_client.pubsub()
-    await pubsub.subscribe("execution_requests", "market_data")
-    logger.info("Execution mode=paper. Listening for risk-approved execution requests...")
 
     last_publish_at = 0.0
     current_prices = {} # symbol -> price
+    loop = asyncio.get_running_loop()
+
+    async def on_market_data(payload: Dict) -> None:
+        nonlocal last_publish_at
+        # Update internal price cache
+        if payload.get("type") == "trade":
+            current_prices[payload["symbol"]] = float(payload["price"])
+
+        # Periodically publish portfolio updates
+        now = loop.time()
+        if (now - last_publish_at) >= publish_interval:
+            await publish_portfolios(redis_client, manager, current_prices)
+            last_publish_at = now
+
+    async def on_execution_request(payload: Dict) -> None:
+        # 1. Validate incoming execution request schema
+        exec_req = validate_and_log(
+            ExecutionRequestEvent, payload, context="execution:consume:execution_requests"
+        )
+        if exec_req is None:
+            return
 
-    set_ready(True)
+        logger.info(
+            "Received execution request [%s]: %s %s %s",
+            exec_req.model_id, exec_req.side, exec_req.qty, exec_req.symbol,
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Execution request payload: %s", json.dumps(payload))
+        price = current_prices.get(exec_req.symbol, 0.0)
+
+        # 2. Simulate Execution (Broker Step) with Async Latency
+        fill = await simulate_fill(exec_req, price, manager)
+        if not fill:
+            return
+
+        # 3. Update Portfolio (Ledger Step)
+        realized_pnl = manager.on_execution_fill(fill)
+
+        # 4. Add additional data to fill event for the dashboard
+        fill['realized_pnl'] = realized_pnl
+        fill.setdefault('schema_version', SCHEMA_VERSION)
+
+        name_map = {
+            "tft_model_01": "TFT Transformer",
+            "lstm_model_01": "LSTM DeepNet",
+            "lightgbm_01": "LightGBM Quant",
+            "sma_cross": "SMA Crossover"
+        }
+        fill['model_name'] = name_map.get(
+            fill.get('model_id', ''),
+            str(fill.get('model_id', '')).replace("_", " ").title()
+        )
 
-    async for message in pubsub.listen():
-        try:
-            if message.get("type") != "message":
-                continue
+        # Validate fill event before publishing
+        fill_event = validate_and_log(
+            ExecutionFilledEvent, fill, context="execution:publish:execution_filled"
+        )
+        if fill_event is None:
+            logger.error("Dropping invalid fill event: %s", fill)
+            return
+
+        # 5. Publish Fill Event (for Dashboard/Logs)
+        publish_payload = fill_event.to_dict()
+        publish_payload['realized_pnl'] = realized_pnl
+        publish_payload['model_name'] = fill['model_name']
+        await redis_client.publish("execution_filled", json.dumps(publish_payload))
+        logger.info(
+            "Executed (%s): %s %s %s @ %s",
+            fill['slippage'], fill['side'], fill['qty'], fill['symbol'], fill['price'],
+        )
 
-            channel = message.get("channel")
-            if isinstance(channel, bytes):
-                channel = channel.decode("utf-8")
-
-            payload = json.loads(message["data"])
-            now = asyncio.get_running_loop().time()
-
-            if channel == "market_data":
-                # Update internal price cache
-                if payload.get("type") == "trade":
-                    current_prices[payload["symbol"]] = float(payload["price"])
-
-                # Periodically publish portfolio updates
-                if (now - last_publish_at) >= publish_interval:
-                    await publish_portfolios(redis_client, manager, current_prices)
-                    last_publish_at = now
-
-            elif channel == "execution_requests":
-                # 1. Validate incoming execution request schema
-                exec_req = validate_and_log(
-                    ExecutionRequestEvent, payload, context="execution:consume:execution_requests"
-                )
-                if exec_req is None:
-                    continue
-
-                logger.info(f"Received execution request: {payload}")
-                price = current_prices.get(exec_req.symbol, 0.0)
-
-                # 2. Simulate Execution (Broker Step) with Async Latency
-                fill = await simulate_fill(payload, price, manager)
-
-                if fill:
-                    # 3. Update Portfolio (Ledger Step)
-                    realized_pnl = manager.on_execution_fill(fill)
-
-                    # 4. Add additional data to fill event for the dashboard
-                    fill['realized_pnl'] = realized_pnl
-                    fill.setdefault('schema_version', SCHEMA_VERSION)
-
-                    name_map = {
-                        "tft_model_01": "TFT Transformer",
-                        "lstm_model_01": "LSTM DeepNet",
-                        "lightgbm_01": "LightGBM Quant",
-                        "sma_cross": "SMA Crossover"
-                    }
-                    fill['model_name'] = name_map.get(
-                        fill.get('model_id', ''),
-                        str(fill.get('model_id', '')).replace("_", " ").title()
-                    )
-
-                    # Validate fill event before publishing
-                    fill_event = validate_and_log(
-                        ExecutionFilledEvent, fill, context="execution:publish:execution_filled"
-                    )
-                    if fill_event is None:
-                        logger.error("Dropping invalid fill event: %s", fill)
-                        continue
-
-                    # 5. Publish Fill Event (for Dashboard/Logs)
-                    publish_payload = fill_event.to_dict()
-                    publish_payload['realized_pnl'] = realized_pnl
-                    publish_payload['model_name'] = fill['model_name']
-                    await redis_client.publish("execution_filled", json.dumps(publish_payload))
-                    logger.info(
-                        f"Executed ({fill['slippage']}): {fill['side']} {fill['qty']} "
-                        f"{fill['symbol']} @ {fill['price']}"
-                    )
+    # Redis Channels — only consume risk-approved execution requests, never raw trade_signals
+    logger.info("Execution mode=paper. Listening for risk-approved execution requests...")
+    set_ready(True)
 
-        except Exception as exc:
-            logger.error(f"Error in paper execution loop: {exc}")
+    await asyncio.gather(
+        _consume_channel(redis_client, "execution_requests", on_execution_request, "paper execution loop"),
+        _consume_channel(redis_client, "market_data", on_market_data, "paper execution loop"),
+    )
 
 async def main():
-    logger.info("Starting TitanFlow TradeExecutor...")
-    redis_host = os.getenv("REDIS_HOST", "redis")
-    redis_client = redis.from_url(f"redis://{redis_host}:6379")
-
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.handlers.QueueHandler(_log_queue)]
+    )
+    log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+    log_listener.start()
     try:
-        await redis_client.ping()
-    except Exception as exc:
-        logger.error(f"Failed to connect to Redis: {exc}")
-        return
+        logger.info("Starting TitanFlow TradeExecutor...")
+        redis_client = get_redis()
 
-    execution_mode = os.getenv("EXECUTION_MODE", "paper").strip().lower()
-    if execution_mode == "live":
-        await asyncio.gather(
-            run_health_server(service="titan-execution"),
-            run_live_execution(redis_client),
-        )
-    else:
-        await asyncio.gather(
-            run_health_server(service="titan-execution"),
-            run_paper_execution(redis_client),
-        )
+        try:
+            await redis_client.ping()
+        except Exception as exc:
+            logger.error("Failed to connect to Redis: %s", exc)
+            return
+
+        execution_mode = os.getenv("EXECUTION_MODE", "paper").strip().lower()
+        if execution_mode == "live":
+            await asyncio.gather(
+                run_health_server(service="titan-execution"),
+                run_live_execution(redis_client),
+            )
+        else:
+            await asyncio.gather(
+                run_health_server(service="titan-execution"),
+                run_paper_execution(redis_client),
+            )
+    except asyncio.CancelledError:
+        # Ctrl+C cancels main() first; log while the listener is still running.
+        logger.info("TradeExecutor stopped.")
+        raise
+    finally:
+        # Writes out anything still queued before returning.
+        log_listener.stop()
 
 if __name__ == "__main__":
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        logger.info("TradeExecutor stopped.")
+        pass
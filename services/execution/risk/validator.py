@@ -18,19 +18,23 @@ class OrderValidator:
         Returns True if order is accepted, False if rejected.
         """
         if qty <= 0 or signal_price <= 0:
-            logger.warning(f"REJECTED: Invalid qty/price ({qty} @ {signal_price})")
+            logger.warning("REJECTED: Invalid qty/price (%s @ %s)", qty, signal_price)
             return False
 
         # 1. Buying Power Check
         estimated_cost = qty * signal_price
         if side == "BUY":
             if portfolio.cash < estimated_cost:
-                logger.warning(f"REJECTED: Insufficient Cash (Need ${estimated_cost:.2f}, Have ${portfolio.cash:.2f})")
+                logger.warning(
+                    "REJECTED: Insufficient Cash (Need $%.2f, Have $%.2f)", estimated_cost, portfolio.cash
+                )
                 return False
 
         # 2. Max Order Value Check
         if estimated_cost > self.MAX_ORDER_VALUE:
-            logger.warning(f"REJECTED: Order Value ${estimated_cost:.2f} exceeds limit ${self.MAX_ORDER_VALUE}")
+            logger.warning(
+                "REJECTED: Order Value $%.2f exceeds limit $%s", estimated_cost, self.MAX_ORDER_VALUE
+            )
             return False
 
         # 3. Dynamic Concentration Check
@@ -55,7 +59,10 @@ class OrderValidator:
             max_pos_size = estimated_equity * self.MAX_CONCENTRATION
             
             if new_val > max_pos_size:
-                 logger.warning(f"REJECTED: Position size ${new_val:.2f} would exceed {self.MAX_CONCENTRATION*100}% of portfolio equity (${max_pos_size:.2f})")
+                 logger.warning(
+                     "REJECTED: Position size $%.2f would exceed %s%% of portfolio equity ($%.2f)",
+                     new_val, self.MAX_CONCENTRATION * 100, max_pos_size,
+                 )
                  return False
 
         return True
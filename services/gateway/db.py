@@ -4,8 +4,13 @@ import os
 import asyncio
 import asyncpg
 import socket
-import redis.asyncio as redis
-import json
+from collections import deque
+from typing import Deque, Dict
+
+from publisher import BatchedPublisher
+from redis_client import create_redis, redis_url
+from serialization import dumps
+from tick_codec import TICK_CHANNEL, pack_tick
 
 logger = logging.getLogger("TitanDB")
 
@@ -13,30 +18,76 @@ class DatabaseManager:
     def __init__(self):
         self.pg_pool = None
         self.redis = None
+        self.publisher = None
         self.quest_host = os.getenv("QUESTDB_HOST", "questdb")
         self.quest_port = int(os.getenv("QUESTDB_PORT", "9009"))  # UDP/TCP Line Protocol
+        # Nothing on the tick path queries Postgres, so the pool is opt-in.
+        self.pg_enabled = os.getenv("GATEWAY_POSTGRES_ENABLED", "false").lower() in ("1", "true", "yes")
         self.pg_dsn = f"postgresql://{os.getenv('POSTGRES_USER')}:{os.getenv('POSTGRES_PASSWORD')}@{os.getenv('POSTGRES_HOST')}/{os.getenv('POSTGRES_DB')}"
-        self.redis_url = f"redis://{os.getenv('REDIS_HOST', 'redis')}:6379"
+        self.redis_url = redis_url()
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM) # UDP for QuestDB
+        # Non-blocking so a full kernel send buffer can never stall the event loop.
+        self.sock.setblocking(False)
+        # Resolved once in connect(); sendto() with a hostname would otherwise
+        # go through the resolver on every datagram.
+        self._quest_addr = (self.quest_host, self.quest_port)
+
+        # ILP lines are accumulated and sent as one datagram per batch.  The
+        # size cap keeps each datagram under a typical 1500-byte Ethernet MTU.
+        self.ilp_max_datagram = int(os.getenv("QUESTDB_ILP_MAX_DATAGRAM", "1400"))
+        self.ilp_flush_interval = float(os.getenv("QUESTDB_ILP_FLUSH_MS", "5")) / 1000.0
+        self._ilp_buf = bytearray()
+        # symbol -> pre-encoded b"market_data,symbol=<SYM> price=" line prefix
+        self._ilp_prefix: Dict[str, bytes] = {}
+        self._ilp_flusher = None
+        # Datagrams waiting for the socket to become writable (oldest dropped first).
+        self._ilp_pending: Deque[bytearray] = deque(
+            maxlen=int(os.getenv("QUESTDB_ILP_MAX_PENDING", "256"))
+        )
 
     async def connect(self):
-        """Initialize PostgreSQL and Redis connections."""
+        """Initialize Redis (and, if enabled, PostgreSQL) connections."""
         try:
-            self.pg_pool = await asyncpg.create_pool(self.pg_dsn)
-            logger.info("Connected to PostgreSQL.")
+            if self.pg_enabled:
+                self.pg_pool = await asyncpg.create_pool(
+                    self.pg_dsn,
+                    min_size=1,
+                    max_size=int(os.getenv("GATEWAY_PG_POOL_MAX", "4")),
+                    statement_cache_size=1024,
+                    command_timeout=5,
+                )
+                logger.info("Connected to PostgreSQL.")
             
-            self.redis = redis.from_url(self.redis_url)
+            self.redis = create_redis(self.redis_url)
             await self.redis.ping()
+            self.publisher = BatchedPublisher(self.redis)
+            self.publisher.start()
             logger.info("Connected to Redis.")
+
+            await self._resolve_questdb()
+            self._ilp_flusher = asyncio.create_task(self._flush_ilp_periodically())
         except Exception as e:
             logger.error(f"Failed to connect to Infrastructure: {e}")
             raise
 
     async def close(self):
         """Close all connections."""
+        if self._ilp_flusher:
+            self._ilp_flusher.cancel()
+            try:
+                await self._ilp_flusher
+            except asyncio.CancelledError:
+                pass
+        self.flush_ticks()
+        if self._ilp_pending:
+            asyncio.get_running_loop().remove_writer(self.sock)
+            logger.warning(f"Dropping {len(self._ilp_pending)} unsent QuestDB datagram(s) on close.")
+            self._ilp_pending.clear()
         if self.pg_pool:
             await self.pg_pool.close()
             logger.info("PostgreSQL connection pool closed.")
+        if self.publisher:
+            await self.publisher.close()
         if self.redis:
             await self.redis.close()
             logger.info("Redis connection closed.")
@@ -44,32 +95,102 @@ class DatabaseManager:
 
     def write_tick(self, symbol: str, price: float, size: int, timestamp: int):
         """
-        Send a tick to QuestDB via InfluxDB Line Protocol (UDP for speed).
+        Buffer a tick for QuestDB via InfluxDB Line Protocol (UDP for speed).
         Format: market_data,symbol=BTCUSD price=45000.0,size=0.5 1634567890000000000
+
+        Lines are packed into a single datagram that is sent once it would
+        exceed ilp_max_datagram bytes, or by the periodic flusher.
         """
+        # Line Protocol: measurement,tags fields timestamp(ns)
+        prefix = self._ilp_prefix.get(symbol)
+        if prefix is None:
+            prefix = self._ilp_prefix[symbol] = f"market_data,symbol={symbol} price=".encode()
+        line = prefix + b"%r,size=%di %d\n" % (float(price), size, timestamp)
+        if self._ilp_buf and len(self._ilp_buf) + len(line) > self.ilp_max_datagram:
+            self.flush_ticks()
+        self._ilp_buf += line
+
+    async def _resolve_questdb(self):
+        """Resolve the QuestDB host once so each sendto() skips name lookup."""
         try:
-            # Line Protocol: measurement,tags fields timestamp(ns)
-            line = f"market_data,symbol={symbol} price={price},size={size}i {timestamp}\n"
-            self.sock.sendto(line.encode(), (self.quest_host, self.quest_port))
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                self.quest_host, self.quest_port,
+                family=socket.AF_INET, type=socket.SOCK_DGRAM,
+            )
+            self._quest_addr = infos[0][4]
+        except OSError as e:
+            logger.warning(f"Could not resolve QuestDB host {self.quest_host}: {e}")
+
+    def flush_ticks(self):
+        """Send all buffered ILP lines to QuestDB as one UDP datagram."""
+        if not self._ilp_buf:
+            return
+        # Hand the filled buffer off and start a fresh one; no copy needed.
+        datagram, self._ilp_buf = self._ilp_buf, bytearray()
+        if self._ilp_pending:
+            # Keep ordering behind datagrams already waiting on the socket.
+            self._ilp_pending.append(datagram)
+            return
+        self._send_datagram(datagram)
+
+    def _send_datagram(self, datagram: bytearray):
+        try:
+            self.sock.sendto(datagram, self._quest_addr)
+        except BlockingIOError:
+            self._ilp_pending.append(datagram)
+            asyncio.get_running_loop().add_writer(self.sock, self._drain_pending)
         except Exception as e:
-            logger.error(f"Failed to write tick to QuestDB: {e}")
+            logger.error(f"Failed to write ticks to QuestDB: {e}")
+
+    def _drain_pending(self):
+        """Writer callback: send queued datagrams until the socket would block."""
+        while self._ilp_pending:
+            try:
+                self.sock.sendto(self._ilp_pending[0], self._quest_addr)
+            except BlockingIOError:
+                return
+            except Exception as e:
+                logger.error(f"Failed to write ticks to QuestDB: {e}")
+            self._ilp_pending.popleft()
+        asyncio.get_running_loop().remove_writer(self.sock)
 
-    async def publish_tick(self, symbol: str, price: float, size: int, timestamp: int):
-        """Publish tick to Redis channel for real-time consumers."""
-        if not self.redis:
+    async def _flush_ilp_periodically(self):
+        """Bound the latency of partially filled ILP datagrams."""
+        while True:
+            await asyncio.sleep(self.ilp_flush_interval)
+            self.flush_ticks()
+
+    def publish_tick(self, symbol: str, price: float, size: int, timestamp: int):
+        """
+        Publish tick to Redis channels for real-time consumers.
+
+        Hot consumers read the packed binary tick on market_data_bin; the JSON
+        copy on market_data is kept for debugging and other subscribers.
+
+        Messages are queued on the batched publisher and flushed with other
+        ticks in a single pipeline round trip, so this is a plain (non-async)
+        call that never waits on Redis.
+        """
+        if not self.publisher:
             return
-            
+
+        # JSON first, each in its own try: a tick the binary codec rejects
+        # (e.g. an oversized symbol or size) must still reach market_data.
         try:
-            message = json.dumps({
+            self.publisher.publish_nowait("market_data", dumps({
                 "symbol": symbol,
                 "price": price,
                 "size": size,
                 "timestamp": timestamp,
                 "type": "trade"
-            })
-            await self.redis.publish("market_data", message)
+            }))
+        except Exception as e:
+            logger.error("Failed to publish %s tick to market_data: %s", symbol, e)
+
+        try:
+            self.publisher.publish_nowait(TICK_CHANNEL, pack_tick(symbol, price, size, timestamp))
         except Exception as e:
-            logger.error(f"Failed to publish to Redis: {e}")
+            logger.error("Failed to publish %s tick to %s: %s", symbol, TICK_CHANNEL, e)
 
     async def get_latest_price(self, symbol: str):
         """Fetch latest price from QuestDB (via PG Wire or REST, not implemented in v1 MVP usually just use cache)."""
@@ -4,6 +4,11 @@ import logging
 import sys
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+except ImportError:  # optional: not available on Windows
+    uvloop = None
+
 # Load environment variables from .env file (for local dev)
 load_dotenv()
 
@@ -29,6 +34,9 @@ async def handle_tick(tick_data):
     if event is None:
         return
 
+    # Both sinks only buffer/enqueue and are flushed by background tasks in
+    # db, so neither call waits on the network and the tick returns at once.
+
     # 2. Write to QuestDB (Fast path)
     db.write_tick(
         symbol=tick_data['symbol'],
@@ -38,7 +46,7 @@ async def handle_tick(tick_data):
     )
 
     # 3. Publish to Redis (Real-time path)
-    await db.publish_tick(
+    db.publish_tick(
         symbol=tick_data['symbol'],
         price=tick_data['price'],
         size=tick_data['size'],
@@ -50,7 +58,7 @@ async def main():
     
     # 1. Connect to Infrastructure
     try:
-        await db.connect() # Postgres
+        await db.connect() # Redis (+ Postgres when GATEWAY_POSTGRES_ENABLED)
         # QuestDB uses UDP, no explicit connect needed for ingest
     except Exception as e:
         logger.error(f"Infrastructure connection failed: {e}")
@@ -88,6 +96,8 @@ async def _run():
     health.cancel()
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     try:
         asyncio.run(_run())
     except KeyboardInterrupt:
@@ -1,19 +1,40 @@
 import asyncio
 import json
 import logging
-from typing import List, Callable, Dict, Any
-from datetime import datetime, timezone
-import pandas as pd
+import random
+import time
+from typing import TYPE_CHECKING, List, Callable, Dict, Any
+from datetime import datetime
 import websockets
 
-from alpaca.data.historical import StockHistoricalDataClient
-from alpaca.data.requests import StockBarsRequest, StockSnapshotRequest
-from alpaca.data.timeframe import TimeFrame
+from serialization import loads
 
 from .base import DataProvider
+from .timestamps import parse_timestamp_ns
+
+# The alpaca-py SDK (and the pandas/numpy stack it pulls in) is only used for
+# historical/snapshot REST calls, so it is imported on first use rather than
+# at gateway startup.
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger("TitanAlpacaProvider")
 
+# Stream tuning for a trusted, high-rate broker feed: allow large batched
+# messages, read the socket in bigger chunks, and skip permessage-deflate
+# (trade batches are small JSON arrays; inflating costs more than it saves).
+_WS_MAX_SIZE = 2 ** 22     # 4 MiB per message
+_WS_READ_LIMIT = 2 ** 20   # 1 MiB StreamReader buffer
+# Keepalive pings detect a dead feed in ~30s instead of waiting on TCP.
+_WS_PING_INTERVAL = 20
+_WS_PING_TIMEOUT = 10
+_WS_CLOSE_TIMEOUT = 5
+
+# Reconnect backoff: doubles per consecutive failure up to the cap, plus
+# jitter so restarted gateways do not reconnect in lockstep.
+_RECONNECT_BASE_DELAY = 1.0
+_RECONNECT_MAX_DELAY = 30.0
+
 class AlpacaDataProvider(DataProvider):
     """
     Implementation of DataProvider using raw Websockets for streaming
@@ -29,15 +50,30 @@ class AlpacaDataProvider(DataProvider):
         if not self.api_key or not self.secret_key:
             raise ValueError("Alpaca API keys (ALPACA_API_KEY, ALPACA_SECRET_KEY) are required.")
 
-        # Initialize Historical Client
-        self.history_client = StockHistoricalDataClient(self.api_key, self.secret_key)
+        self._history_client = None
         self.callback = None
         self.ws = None
 
+    @property
+    def history_client(self):
+        """Alpaca-py historical data client, created on first use."""
+        if self._history_client is None:
+            from alpaca.data.historical import StockHistoricalDataClient
+            self._history_client = StockHistoricalDataClient(self.api_key, self.secret_key)
+        return self._history_client
+
     async def _connect_and_auth(self):
         """Connect and Authenticate."""
         logger.info(f"Connecting to {self.base_url}...")
-        self.ws = await websockets.connect(self.base_url)
+        self.ws = await websockets.connect(
+            self.base_url,
+            max_size=_WS_MAX_SIZE,
+            read_limit=_WS_READ_LIMIT,
+            compression=None,
+            ping_interval=_WS_PING_INTERVAL,
+            ping_timeout=_WS_PING_TIMEOUT,
+            close_timeout=_WS_CLOSE_TIMEOUT,
+        )
         
         # Auth
         auth_payload = {
@@ -52,7 +88,9 @@ class AlpacaDataProvider(DataProvider):
     async def subscribe(self, symbols: List[str], callback: Callable[[Dict[str, Any]], None]) -> None:
         """Subscribe to real-time trade updates."""
         self.callback = callback
-        
+        failures = 0
+        delay = _RECONNECT_BASE_DELAY
+
         while True:
             try:
                 await self._connect_and_auth()
@@ -64,22 +102,21 @@ class AlpacaDataProvider(DataProvider):
                 }
                 await self.ws.send(json.dumps(sub_payload))
                 logger.info(f"Subscribed to trades for: {symbols}")
+                if failures:
+                    logger.info(f"Stream recovered after {failures} failed attempt(s).")
+                failures = 0
+                delay = _RECONNECT_BASE_DELAY
                 
                 # Listen
                 async for message in self.ws:
-                    data = json.loads(message)
+                    data = loads(message)
                     for item in data:
                         if item.get("T") == "t": # Trade
-                            # Parse ISO 8601 timestamp → Unix nanoseconds
-                            ts_str = item.get("t", "")
+                            # Parse RFC-3339 timestamp → Unix nanoseconds
                             try:
-                                ts_ns = int(
-                                    datetime.fromisoformat(
-                                        ts_str.replace("Z", "+00:00")
-                                    ).timestamp() * 1_000_000_000
-                                )
-                            except Exception:
-                                ts_ns = int(datetime.now(timezone.utc).timestamp() * 1_000_000_000)
+                                ts_ns = parse_timestamp_ns(item.get("t", ""))
+                            except ValueError:
+                                ts_ns = time.time_ns()
 
                             normalized = {
                                 "type": "trade",
@@ -94,12 +131,20 @@ class AlpacaDataProvider(DataProvider):
                             logger.error(f"Stream error: {item}")
                             
             except Exception as e:
-                logger.error(f"Stream connection lost: {e}. Reconnecting in 5s...")
-                await asyncio.sleep(5)
+                failures += 1
+                wait = delay + random.uniform(0, 0.5)
+                logger.error(
+                    f"Stream connection lost ({failures} consecutive): {e}. "
+                    f"Reconnecting in {wait:.1f}s..."
+                )
+                await asyncio.sleep(wait)
+                delay = min(_RECONNECT_MAX_DELAY, delay * 2)
 
-    def get_historical_bars(self, symbol: str, start: datetime, end: datetime, timeframe: str) -> pd.DataFrame:
+    def get_historical_bars(self, symbol: str, start: datetime, end: datetime, timeframe: str) -> "pd.DataFrame":
         """Fetch historical bars."""
-        # Method remains same
+        from alpaca.data.requests import StockBarsRequest
+        from alpaca.data.timeframe import TimeFrame
+
         tf_map = {
             "1Min": TimeFrame.Minute,
             "1Hour": TimeFrame.Hour,
@@ -117,6 +162,8 @@ class AlpacaDataProvider(DataProvider):
         return bars.df
 
     def get_latest_price(self, symbol: str) -> float:
+        from alpaca.data.requests import StockSnapshotRequest
+
         request = StockSnapshotRequest(symbol_or_symbols=symbol)
         snapshot = self.history_client.get_stock_snapshot(request)
         if snapshot and symbol in snapshot:
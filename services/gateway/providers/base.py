@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-import pandas as pd
 from datetime import datetime
-from typing import List, Callable, Dict, Any
+from typing import TYPE_CHECKING, List, Callable, Dict, Any
+
+if TYPE_CHECKING:  # pandas is only needed for historical bars; keep it off startup
+    import pandas as pd
 
 class DataProvider(ABC):
     """
@@ -24,7 +26,7 @@ class DataProvider(ABC):
         pass
         
     @abstractmethod
-    def get_historical_bars(self, symbol: str, start: datetime, end: datetime, timeframe: str) -> pd.DataFrame:
+    def get_historical_bars(self, symbol: str, start: datetime, end: datetime, timeframe: str) -> "pd.DataFrame":
         """
         Fetch historical bar data.
         
@@ -1,10 +1,12 @@
 import asyncio
 import logging
-import random
-import math
 from datetime import datetime, timedelta
-from typing import List, Callable, Dict, Any
-import pandas as pd
+from time import time_ns
+from typing import TYPE_CHECKING, List, Callable, Dict, Any
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 from .base import DataProvider
 
@@ -32,60 +34,71 @@ class SyntheticDataProvider(DataProvider):
         self.volatility = 0.0002 # Per-tick volatility
         self.dt = 1/252/390/60 # Approx 1 second in trading years (very rough)
         self.is_running = False
+        self._rng = np.random.default_rng()
 
     async def subscribe(self, symbols: List[str], callback: Callable[[Dict[str, Any]], None]) -> None:
-        """Start generating synthetic trades."""
+        """
+        Start generating synthetic trades.
+
+        Each symbol's trade dict is reused and updated in place on every
+        tick, so callbacks must copy or serialize it rather than keep it.
+        """
         self.is_running = True
         logger.info(f"Starting Synthetic Data Stream for: {symbols}")
-        
+
+        for symbol in symbols:
+            self.prices.setdefault(symbol, 100.0) # Default start
+        # GBM state for the subscribed symbols, stepped as one vector per tick.
+        prices = np.array([self.prices[s] for s in symbols], dtype=np.float64)
+        n = prices.size
+        trades = [
+            {"type": "trade", "symbol": s, "price": 0.0, "size": 0, "timestamp": 0, "provider": "synthetic"}
+            for s in symbols
+        ]
+
         while self.is_running:
-            for symbol in symbols:
-                if symbol not in self.prices:
-                    self.prices[symbol] = 100.0 # Default start
-
-                # Geometric Brownian Motion Step
-                # dS = S * (mu*dt + sigma*dW)
-                # Simplified: S_new = S_old * exp(drift + diffusion)
-                shock = random.gauss(0, self.volatility)
-                self.prices[symbol] *= math.exp(shock)
-                
-                # Create Trade Object
-                price = round(self.prices[symbol], 2)
-                size = random.randint(1, 100)
-                
-                trade = {
-                    "type": "trade",
-                    "symbol": symbol,
-                    "price": price,
-                    "size": size,
-                    "timestamp": int(datetime.utcnow().timestamp() * 1e9),
-                    "provider": "synthetic"
-                }
-                
+            # Geometric Brownian Motion Step
+            # dS = S * (mu*dt + sigma*dW)
+            # Simplified: S_new = S_old * exp(drift + diffusion)
+            shocks = self._rng.normal(0, self.volatility, size=n)
+            np.multiply(prices, np.exp(shocks, out=shocks), out=prices)
+
+            sizes = self._rng.integers(1, 101, size=n).tolist()
+            # Quantize to integer cents once for the whole vector; the
+            # float dollar price is only materialized in the message.
+            cents = np.rint(prices * 100).astype(np.int64).tolist()
+            self.prices.update(zip(symbols, prices.tolist()))
+
+            for trade, price_cents, size in zip(trades, cents, sizes):
+                trade["price"] = price_cents / 100
+                trade["size"] = size
+                trade["timestamp"] = time_ns()
                 await callback(trade)
-            
+
             # Throttle to mimic realistic tick rate (e.g. 10 updates per second total loop)
             await asyncio.sleep(0.1)
 
-    def get_historical_bars(self, symbol: str, start: datetime, end: datetime, timeframe: str) -> pd.DataFrame:
+    def get_historical_bars(self, symbol: str, start: datetime, end: datetime, timeframe: str) -> "pd.DataFrame":
         """Generate fake historical data."""
+        import pandas as pd
+
         # Simple generation for now, just to satisfy interface
         dates = pd.date_range(start=start, end=end, freq='D' if timeframe == '1Day' else '1min')
-        df = pd.DataFrame(index=dates)
-        
-        # Random walk
-        price = 100.0
-        prices = []
-        for _ in range(len(dates)):
-            change = random.gauss(0, 0.01)
-            price *= (1 + change)
-            prices.append(price)
-            
-        df['close'] = prices
-        df['open'] = df['close'].shift(1).fillna(prices[0])
-        df['high'] = df[['open', 'close']].max(axis=1) * 1.005
-        df['low'] = df[['open', 'close']].min(axis=1) * 0.995
-        df['volume'] = [random.randint(1000, 50000) for _ in range(len(dates))]
+        n = len(dates)
+
+        # Random walk, built as whole arrays; the frame is assembled once.
+        close = 100.0 * np.cumprod(1.0 + self._rng.normal(0, 0.01, n))
+        open_ = np.empty_like(close)
+        open_[1:] = close[:-1]
+        open_[:1] = close[:1]
+
+        df = pd.DataFrame({
+            'close': close,
+            'open': open_,
+            'high': np.maximum(open_, close) * 1.005,
+            'low': np.minimum(open_, close) * 0.995,
+            'volume': self._rng.integers(1000, 50001, size=n),
+        }, index=dates)
         
         return df
 
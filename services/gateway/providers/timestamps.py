@@ -0,0 +1,59 @@
+"""
+Timestamp parsing for provider feeds.
+
+Alpaca stamps every trade with an RFC-3339 UTC string carrying up to
+nanosecond precision, e.g. ``2024-01-02T15:04:05.123456789Z``.  The stdlib
+``datetime.fromisoformat`` (Python 3.10) rejects both the trailing ``Z`` and
+more than six fractional digits, and round-tripping through a float
+``timestamp()`` loses nanoseconds, so the fast path here parses the string
+with integer arithmetic only.
+
+Trades arrive many times per second, so the epoch value of the whole-second
+prefix is cached and only the fractional digits are parsed per tick.
+"""
+from datetime import datetime, timezone
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NS_PER_SECOND = 1_000_000_000
+
+# (whole-second prefix "YYYY-MM-DDTHH:MM:SS", its Unix time in nanoseconds)
+_second_cache = ("", 0)
+
+
+def _datetime_to_ns(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * _NS_PER_SECOND + delta.microseconds * 1_000
+
+
+def parse_timestamp_ns(ts: str) -> int:
+    """
+    Convert an ISO-8601 / RFC-3339 timestamp into Unix nanoseconds.
+
+    UTC ``Z`` strings take the cached fast path; anything else (explicit
+    offsets, date-only strings) falls back to ``datetime.fromisoformat``.
+
+    Raises:
+        ValueError: if the string is not a valid timestamp.
+    """
+    global _second_cache
+
+    if len(ts) < 20 or ts[-1] != "Z" or ts[10] != "T":
+        return _datetime_to_ns(datetime.fromisoformat(ts))
+
+    second = ts[:19]
+    cached_second, second_ns = _second_cache
+    if second != cached_second:
+        second_ns = _datetime_to_ns(datetime.fromisoformat(second))
+        _second_cache = (second, second_ns)
+
+    if ts[19] != ".":
+        if len(ts) != 20:
+            raise ValueError(f"Invalid timestamp: {ts!r}")
+        return second_ns
+
+    frac = ts[20:-1]
+    if not frac.isdigit():
+        raise ValueError(f"Invalid timestamp fraction: {ts!r}")
+    return second_ns + int(frac[:9].ljust(9, "0"))
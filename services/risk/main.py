@@ -12,14 +12,17 @@ Enterprise controls wired in:
 """
 
 import asyncio
-import json
 import logging
 import os
 import sys
 
-import redis.asyncio as redis
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+except ImportError:  # optional: not available on Windows
+    uvloop = None
+
 from risk_engine import RiskEngine
 from schemas import (
     TradeSignalEvent,
@@ -29,6 +32,10 @@ from schemas import (
     SCHEMA_VERSION,
 )
 from health import run_health_server, set_ready
+from publisher import BatchedPublisher
+import pubsub_protocol
+from redis_client import create_redis
+from serialization import dumps, loads
 
 load_dotenv()
 
@@ -42,6 +49,21 @@ logger = logging.getLogger("TitanRiskGuardian")
 # How often to evaluate rolling model metrics (every N signals processed)
 _PERFORMANCE_CHECK_INTERVAL = int(os.getenv("RISK_PERF_CHECK_INTERVAL", "10"))
 
+# Minimum gap between repeats of the same risk command.  While the kill switch
+# stays active every rejected signal would otherwise re-send LIQUIDATE_ALL.
+_COMMAND_REPUBLISH_SECONDS = float(os.getenv("RISK_COMMAND_REPUBLISH_SECONDS", "1.0"))
+
+# Actionable signals -> (execution side, is_buy).  HOLD, the only other valid
+# TradeSignalEvent.signal, has no entry and places no order.
+_SIDE_TABLE = {"BUY": ("buy", True), "SELL": ("sell", False)}
+
+# Socket sizing for the pubsub connection: a larger kernel receive buffer and
+# read size let bursts of signals/fills drain in fewer recv() calls.
+_PUBSUB_RCVBUF = int(os.getenv("RISK_PUBSUB_RCVBUF", str(1 << 20)))
+_PUBSUB_READ_SIZE = int(os.getenv("RISK_PUBSUB_READ_SIZE", str(1 << 18)))
+# Messages read off the pubsub socket but not yet processed.
+_INBOX_MAX = int(os.getenv("RISK_INBOX_MAX", "4096"))
+
 
 def _load_and_validate_config() -> dict:
     """Load risk configuration from environment variables and validate ranges."""
@@ -99,133 +121,231 @@ async def main():
         f"| rollback_sharpe={config['ROLLBACK_MIN_SHARPE']}"
     )
 
+    # Raw (channel, data) messages read off the socket but not yet processed.
+    # A full queue applies backpressure to the reader rather than dropping
+    # signals.
+    inbox: asyncio.Queue = asyncio.Queue(maxsize=_INBOX_MAX)
+
     # --- Connect to Redis ---
-    redis_host = os.getenv("REDIS_HOST", "redis")
+    # The subscription holds its connection for good, so it gets one of its
+    # own; ``r`` is shared by the batched publisher and risk_commands.
+    subscriber = None
+    pubsub = None
     try:
-        r = redis.from_url(f"redis://{redis_host}:6379")
+        r = create_redis()
         await r.ping()
-        pubsub = r.pubsub()
-        await pubsub.subscribe("trade_signals", "execution_filled")
+        if pubsub_protocol.AVAILABLE:
+            # hiredis-backed asyncio.Protocol: parsed messages go straight
+            # into the inbox from data_received().
+            subscriber = await pubsub_protocol.open_subscriber(
+                os.getenv("REDIS_HOST", "redis"),
+                int(os.getenv("REDIS_PORT", "6379")),
+                ["trade_signals", "execution_filled"],
+                inbox,
+                recv_buffer=_PUBSUB_RCVBUF,
+            )
+        else:
+            # Subscribe confirmations are dropped inside redis-py, so the
+            # listen loop only ever sees published messages.
+            pubsub = create_redis(
+                recv_buffer=_PUBSUB_RCVBUF, read_size=_PUBSUB_READ_SIZE
+            ).pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe("trade_signals", "execution_filled")
         logger.info("Connected to Redis. Subscribed to [trade_signals, execution_filled].")
     except Exception as exc:
-        logger.error(f"Failed to connect to Redis: {exc}")
+        logger.error("Failed to connect to Redis: %s", exc)
         return
 
+    # Approved execution requests are pipelined; risk_commands stay immediate
+    # but first flush the queue so they never overtake an approved request.
+    publisher = BatchedPublisher(r)
+    publisher.start()
+
     signals_processed = 0
 
-    set_ready(True)
-    logger.info("RiskGuardian listening for events...")
+    # command -> loop time it was last published; cleared when re-armed.
+    command_sent_at: dict = {}
+    loop = asyncio.get_running_loop()
+
+    async def publish_command(payload: dict) -> None:
+        """Publish to risk_commands unless the same command just went out."""
+        command = payload["command"]
+        now = loop.time()
+        last = command_sent_at.get(command)
+        if last is not None and now - last < _COMMAND_REPUBLISH_SECONDS:
+            return
+        command_sent_at[command] = now
+        await publisher.flush()
+        await r.publish("risk_commands", dumps(payload))
+
+    # Bound methods used on every message, looked up once here instead of
+    # per call inside the handlers.
+    record_trade_result = engine.record_trade_result
+    record_prediction = engine.record_prediction
+    process_signal = engine.process_signal
+    publish_nowait = publisher.publish_nowait
+
+    # ----------------------------------------------------------------
+    # execution_filled: record trade result for model-performance tracking
+    # ----------------------------------------------------------------
+    async def handle_fill(data: dict) -> None:
+        fill = validate_and_log(
+            ExecutionFilledEvent, data, context="risk:consume:execution_filled"
+        )
+        if fill is None:
+            return
 
-    async for message in pubsub.listen():
-        try:
-            if message["type"] != "message":
-                continue
+        if fill.price > 0:
+            raw_return = -fill.slippage / fill.price  # negative slippage = cost
+            correct_direction = (
+                raw_return >= 0 if fill.side == "BUY" else raw_return <= 0
+            )
+            record_trade_result(raw_return)
+            record_prediction(correct_direction, raw_return)
 
-            channel = message.get("channel", b"")
-            if isinstance(channel, bytes):
-                channel = channel.decode("utf-8")
+    # Level is fixed at startup, so the per-signal INFO lines check a cached
+    # flag instead of building their arguments for a disabled logger.
+    info_enabled = logger.isEnabledFor(logging.INFO)
 
-            data = json.loads(message["data"])
+    # ----------------------------------------------------------------
+    # trade_signals: apply risk governance before forwarding
+    # ----------------------------------------------------------------
+    async def handle_signal(data: dict) -> None:
+        nonlocal signals_processed
 
-            # ----------------------------------------------------------------
-            # execution_filled: record trade result for model-performance tracking
-            # ----------------------------------------------------------------
-            if channel == "execution_filled":
-                fill = validate_and_log(
-                    ExecutionFilledEvent, data, context="risk:consume:execution_filled"
-                )
-                if fill is None:
-                    continue
-
-                if fill.price > 0:
-                    raw_return = -fill.slippage / fill.price  # negative slippage = cost
-                    correct_direction = (
-                        raw_return >= 0 if fill.side == "BUY" else raw_return <= 0
-                    )
-                    engine.record_trade_result(raw_return)
-                    engine.record_prediction(correct_direction, raw_return)
-                continue
-
-            # ----------------------------------------------------------------
-            # trade_signals: apply risk governance before forwarding
-            # ----------------------------------------------------------------
-            signal_event = validate_and_log(
-                TradeSignalEvent, data, context="risk:consume:trade_signals"
-            )
-            if signal_event is None:
-                continue
-
-            logger.info(f"Received signal: {data}")
-
-            # 1. Validate (kill switch + manual approval mode)
-            if not engine.validate_signal(data):
-                if engine.is_kill_switch_active:
-                    # Broadcast liquidation command so execution service reacts
-                    await r.publish("risk_commands", json.dumps({
-                        "command": "LIQUIDATE_ALL",
-                        "reason": "kill_switch_active",
-                    }))
-                continue
-
-            # 2. Evaluate kill switch conditions
-            if engine.check_kill_switch():
-                logger.warning("Kill switch triggered — publishing LIQUIDATE_ALL command.")
-                await r.publish("risk_commands", json.dumps({
+        signal_event = validate_and_log(
+            TradeSignalEvent, data, context="risk:consume:trade_signals"
+        )
+        if signal_event is None:
+            return
+
+        if info_enabled:
+            logger.info("Received signal: %s", data)
+
+        # TradeSignalEvent.from_dict already upper-cases the signal.
+        side_entry = _SIDE_TABLE.get(signal_event.signal)
+        if side_entry is None:
+            return
+        side, is_buy = side_entry
+
+        # 1-3. Validation, kill-switch evaluation and position sizing in one
+        # engine call.
+        was_halted = engine.is_kill_switch_active
+        units = process_signal(signal_event.price, is_buy)
+
+        if units <= 0:
+            if engine.is_kill_switch_active:
+                if not was_halted:
+                    # Freshly tripped: the command must go out immediately.
+                    command_sent_at.clear()
+                    logger.warning("Kill switch triggered — publishing LIQUIDATE_ALL command.")
+                # Broadcast liquidation command so execution service reacts
+                await publish_command({
                     "command": "LIQUIDATE_ALL",
-                    "reason": "drawdown_or_consecutive_loss_limit_breached",
-                }))
-                continue
-
-            # 3. Calculate position size (Fixed Fractional)
-            price = signal_event.price
-            if price <= 0:
-                logger.error(f"Signal missing valid price: {data}")
-                continue
-
-            stop_loss = price * (0.98 if signal_event.signal == "BUY" else 1.02)
-            units = engine.calculate_position_size(price, stop_loss)
-
-            if units <= 0:
-                logger.info(f"Position size=0 for {signal_event.symbol} — skipping.")
-                continue
-
-            # 4. Build and validate the execution request before publishing
-            execution_payload = ExecutionRequestEvent(
-                model_id=signal_event.model_id,
-                symbol=signal_event.symbol,
-                qty=units,
-                side="buy" if signal_event.signal == "BUY" else "sell",
-                type="market",
-                confidence=signal_event.confidence,
-                explanation=signal_event.explanation,
-                timestamp=signal_event.timestamp,
-                schema_version=SCHEMA_VERSION,
+                    "reason": (
+                        "kill_switch_active" if was_halted
+                        else "drawdown_or_consecutive_loss_limit_breached"
+                    ),
+                })
+            elif not engine.is_manual_approval_mode:
+                # Guards passed but nothing to trade; any earlier command has
+                # been cleared by an operator.
+                command_sent_at.clear()
+                logger.info("Position size=0 for %s — skipping.", signal_event.symbol)
+            return
+
+        # Both guards passed, so any earlier command has been cleared by an
+        # operator; the next trigger must go out immediately.
+        if command_sent_at:
+            command_sent_at.clear()
+
+        # 4. Build and validate the execution request before publishing
+        execution_payload = ExecutionRequestEvent(
+            model_id=signal_event.model_id,
+            symbol=signal_event.symbol,
+            qty=units,
+            side=side,
+            type="market",
+            confidence=signal_event.confidence,
+            explanation=signal_event.explanation,
+            timestamp=signal_event.timestamp,
+            schema_version=SCHEMA_VERSION,
+        )
+        if not publish_nowait("execution_requests", dumps(execution_payload.to_dict())):
+            logger.error(
+                "Execution request DROPPED (publish queue full) → %s %s %s",
+                execution_payload.side.upper(), units, execution_payload.symbol,
             )
-            await r.publish("execution_requests", json.dumps(execution_payload.to_dict()))
+            return
+        if info_enabled:
             logger.info(
-                f"Approved → {execution_payload.side.upper()} "
-                f"{units} {execution_payload.symbol}"
+                "Approved → %s %s %s",
+                execution_payload.side.upper(), units, execution_payload.symbol,
             )
 
-            # 5. Periodic model performance check → rollback if needed
-            signals_processed += 1
-            if signals_processed % _PERFORMANCE_CHECK_INTERVAL == 0:
-                rolled_back = engine.check_model_performance()
-                if rolled_back:
-                    sharpe = engine.get_rolling_sharpe()
-                    accuracy = engine.get_rolling_accuracy()
-                    await r.publish("risk_commands", json.dumps({
-                        "command": "ACTIVATE_MANUAL_APPROVAL",
-                        "reason": "model_performance_below_threshold",
-                        "rolling_sharpe": sharpe,
-                        "rolling_accuracy": accuracy,
-                    }))
-                    logger.warning(
-                        f"Model rollback published | sharpe={sharpe} accuracy={accuracy}"
-                    )
-
-        except Exception as exc:
-            logger.error(f"Error processing message: {exc}")
+        # 5. Periodic model performance check → rollback if needed
+        signals_processed += 1
+        if signals_processed % _PERFORMANCE_CHECK_INTERVAL == 0:
+            rolled_back = engine.check_model_performance()
+            if rolled_back:
+                sharpe = engine.get_rolling_sharpe()
+                accuracy = engine.get_rolling_accuracy()
+                await publish_command({
+                    "command": "ACTIVATE_MANUAL_APPROVAL",
+                    "reason": "model_performance_below_threshold",
+                    "rolling_sharpe": sharpe,
+                    "rolling_accuracy": accuracy,
+                })
+                logger.warning(
+                    "Model rollback published | sharpe=%s accuracy=%s", sharpe, accuracy
+                )
+
+    # Channel names arrive as raw bytes, so they key the table undecoded.
+    handlers = {
+        b"trade_signals": handle_signal,
+        b"execution_filled": handle_fill,
+    }
+
+    # A single worker processes the inbox in arrival order (engine state is
+    # not safe to share between concurrent handlers).
+    async def drain_inbox() -> None:
+        get, task_done = inbox.get, inbox.task_done
+        get_handler, decode = handlers.get, loads
+        while True:
+            channel, data = await get()
+            handler = get_handler(channel)
+            if handler is not None:
+                await handler(decode(data))
+            task_done()
+
+    async def process_messages() -> None:
+        # Errors are handled out here rather than per message: the message
+        # that raised is marked done and draining resumes with the next one.
+        while True:
+            try:
+                await drain_inbox()
+            except Exception as exc:
+                logger.error("Error processing message: %s", exc)
+                inbox.task_done()
+
+    set_ready(True)
+    logger.info("RiskGuardian listening for events...")
+
+    worker = asyncio.create_task(process_messages())
+    try:
+        if subscriber is not None:
+            await subscriber.wait_closed()
+        else:
+            async for message in pubsub.listen():
+                await inbox.put((message["channel"], message["data"]))
+        # Subscription ended: finish what was already read before returning.
+        await inbox.join()
+    finally:
+        worker.cancel()
+        if subscriber is not None:
+            subscriber.close()
+        # Hand any approved requests still queued to Redis before exiting.
+        await publisher.close()
 
 
 async def _run():
@@ -235,6 +355,8 @@ async def _run():
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     try:
         asyncio.run(_run())
     except KeyboardInterrupt:
@@ -23,6 +23,10 @@ from typing import List, Optional
 
 logger = logging.getLogger("TitanRisk")
 
+# Stop-loss distance indexed by ``is_buy``: shorts stop 2% above entry,
+# longs 2% below.
+_STOP_LOSS_MULT = (1.02, 0.98)
+
 
 class RiskEngine:
     def __init__(self, config: dict):
@@ -38,15 +42,24 @@ class RiskEngine:
         self.rollback_min_accuracy: float = config.get("ROLLBACK_MIN_ACCURACY", 0.50)
 
         # --- Account state ---
+        # Setting starting_equity also refreshes _kill_threshold.
+        self._kill_threshold: float = 0.0
         self.starting_equity: float = 0.0
         self.current_equity: float = 0.0
         self.daily_pnl: float = 0.0
         self.consecutive_losses: int = 0
 
         # --- Model performance tracking (rolling window) ---
-        self._recent_predictions: List[bool] = []   # True=correct, False=wrong
-        self._recent_returns: List[float] = []       # trade return percentages
+        # Fixed-size ring buffers with running totals, so recording an outcome
+        # and reading the rolling metrics are O(1) regardless of window size.
         self._window_size: int = 20                  # rolling window for metrics
+        self._recent_predictions: List[bool] = [False] * self._window_size  # True=correct
+        self._recent_returns: List[float] = [0.0] * self._window_size       # trade return pcts
+        self._window_pos: int = 0       # next slot to overwrite
+        self._window_count: int = 0     # filled slots (<= window size)
+        self._correct_count: int = 0
+        self._returns_sum: float = 0.0
+        self._returns_sumsq: float = 0.0
 
         # --- Control flags ---
         self.is_kill_switch_active: bool = False
@@ -56,6 +69,17 @@ class RiskEngine:
     # Account state
     # ------------------------------------------------------------------
 
+    @property
+    def starting_equity(self) -> float:
+        return self._starting_equity
+
+    @starting_equity.setter
+    def starting_equity(self, value: float) -> None:
+        self._starting_equity = value
+        # Daily P&L at or below this trips the drawdown kill switch; kept
+        # precomputed so the per-signal check needs no division.
+        self._kill_threshold = -self.max_daily_loss_pct * value
+
     def update_account_state(self, equity: float, daily_pnl: float) -> None:
         """
         Refresh internal state from broker or portfolio data.
@@ -80,13 +104,12 @@ class RiskEngine:
             • Daily drawdown exceeds max_daily_loss_pct, OR
             • Consecutive losses exceed max_consecutive_losses.
         """
-        if self.starting_equity <= 0:
+        if self._starting_equity <= 0:
             return False
 
-        drawdown_pct = self.daily_pnl / self.starting_equity
-
         # Drawdown threshold
-        if drawdown_pct <= -self.max_daily_loss_pct:
+        if self.daily_pnl <= self._kill_threshold:
+            drawdown_pct = self.daily_pnl / self._starting_equity
             logger.critical(
                 f"KILL SWITCH: Daily drawdown {drawdown_pct:.2%} exceeds "
                 f"limit -{self.max_daily_loss_pct:.2%}."
@@ -161,6 +184,37 @@ class RiskEngine:
 
         return True
 
+    def process_signal(self, price: float, is_buy: bool) -> int:
+        """
+        Run the whole pre-trade gate for one signal in a single call:
+        validate_signal, check_kill_switch and fixed-fractional sizing
+        against a 2% stop-loss.
+
+        Returns the number of units to trade; 0 means the signal is
+        suppressed (the reason is logged, and is_kill_switch_active tells
+        the caller whether trading is now halted).
+        """
+        if self.is_kill_switch_active:
+            logger.warning("Signal REJECTED — kill switch active.")
+            return 0
+        if self.is_manual_approval_mode:
+            logger.info(
+                "Signal QUEUED — manual approval mode active. "
+                "Auto-execution suspended pending model review."
+            )
+            return 0
+        if self.check_kill_switch():
+            return 0
+        if price <= 0:
+            logger.error("Signal missing valid price: %s", price)
+            return 0
+
+        risk_per_share = abs(price - price * _STOP_LOSS_MULT[is_buy])
+        if risk_per_share == 0:
+            logger.error("Invalid stop_loss: equal to entry_price. Returning 0.")
+            return 0
+        return math.floor(self.current_equity * self.risk_per_trade_pct / risk_per_share)
+
     # ------------------------------------------------------------------
     # Model performance monitoring → Manual Approval rollback
     # ------------------------------------------------------------------
@@ -173,22 +227,36 @@ class RiskEngine:
             correct:           True if the model's directional prediction was right.
             trade_return_pct:  Actual return of the trade (signed, e.g. -0.012 = -1.2%).
         """
-        self._recent_predictions.append(correct)
-        self._recent_returns.append(trade_return_pct)
+        pos = self._window_pos
+        if self._window_count == self._window_size:
+            # Evict the oldest outcome from the running totals.
+            old_r = self._recent_returns[pos]
+            self._correct_count -= self._recent_predictions[pos]
+            self._returns_sum -= old_r
+            self._returns_sumsq -= old_r * old_r
+        else:
+            self._window_count += 1
+
+        self._recent_predictions[pos] = correct
+        self._recent_returns[pos] = trade_return_pct
+        self._correct_count += correct
+        self._returns_sum += trade_return_pct
+        self._returns_sumsq += trade_return_pct * trade_return_pct
 
-        # Trim to window
-        if len(self._recent_predictions) > self._window_size:
-            self._recent_predictions.pop(0)
-        if len(self._recent_returns) > self._window_size:
-            self._recent_returns.pop(0)
+        self._window_pos = (pos + 1) % self._window_size
+        if self._window_pos == 0:
+            # Once per full lap, recompute the float totals exactly so
+            # add/subtract rounding error cannot accumulate.
+            self._returns_sum = math.fsum(self._recent_returns)
+            self._returns_sumsq = math.fsum(r * r for r in self._recent_returns)
 
     def get_rolling_accuracy(self) -> Optional[float]:
         """
         Return rolling directional accuracy, or None if insufficient data.
         """
-        if len(self._recent_predictions) < 5:
+        if self._window_count < 5:
             return None
-        return sum(self._recent_predictions) / len(self._recent_predictions)
+        return self._correct_count / self._window_count
 
     def get_rolling_sharpe(self) -> Optional[float]:
         """
@@ -196,18 +264,19 @@ class RiskEngine:
         Assumes daily returns; annualisation factor = sqrt(252).
         Returns None if insufficient data or zero volatility.
         """
-        if len(self._recent_returns) < 5:
+        n = self._window_count
+        if n < 5:
             return None
 
-        n = len(self._recent_returns)
-        mean_r = sum(self._recent_returns) / n
-        variance = sum((r - mean_r) ** 2 for r in self._recent_returns) / n
-        std_r = variance ** 0.5
+        mean_r = self._returns_sum / n
+        mean_sq = self._returns_sumsq / n
+        variance = mean_sq - mean_r * mean_r
 
-        if std_r == 0:
+        # Identical returns leave only rounding noise in E[r^2] - E[r]^2.
+        if variance <= 1e-12 * mean_sq:
             return None
 
-        sharpe = (mean_r / std_r) * (252 ** 0.5)
+        sharpe = (mean_r / math.sqrt(variance)) * (252 ** 0.5)
         return round(sharpe, 4)
 
     def check_model_performance(self) -> bool:
@@ -244,7 +313,7 @@ class RiskEngine:
         if triggered:
             self.is_manual_approval_mode = True
             logger.warning(
-                f"MODEL ROLLBACK — switching to manual approval mode. {reason}"
+                "MODEL ROLLBACK — switching to manual approval mode. %s", reason
             )
 
         return triggered
@@ -1,14 +1,36 @@
 import logging
 import os
+import time
+from typing import Dict, Tuple
 from urllib.parse import quote_plus
 import asyncpg
 import asyncpg.exceptions
 import redis.asyncio as redis
-import json
 import pandas as pd
 
+from redis_client import get_redis, redis_url
+from serialization import dumps
+
 logger = logging.getLogger("TitanSignalDB")
 
+# Constant query text with bind parameters for both symbol and limit, so
+# asyncpg's per-connection statement cache prepares it once and every later
+# fetch skips QuestDB's parse/plan step.
+_OHLCV_QUERY = """
+SELECT
+    timestamp,
+    first(price) as open,
+    max(price)   as high,
+    min(price)   as low,
+    last(price)  as close,
+    sum(size)    as volume
+FROM market_data
+WHERE symbol = $1
+SAMPLE BY 1m ALIGN TO CALENDAR
+ORDER BY timestamp DESC
+LIMIT $2
+"""
+
 class SignalDB:
     def __init__(self):
         # QuestDB (PG Wire) — credentials must be supplied via environment variables.
@@ -27,10 +49,14 @@ class SignalDB:
             )
 
         # Redis
-        self.redis_url = f"redis://{os.getenv('REDIS_HOST', 'redis')}:6379"
+        self.redis_url = redis_url()
         self.redis = None
         self.quest_pool = None
 
+        # Bars are minute-aligned, so fetches inside the same wall-clock minute
+        # are served from memory: (symbol, limit, minute) -> rows.
+        self._ohlcv_cache: Dict[Tuple[str, int, int], list] = {}
+
     async def connect(self):
         """Connect to QuestDB and Redis."""
         try:
@@ -47,8 +73,8 @@ class SignalDB:
                 self.quest_host, self.quest_port,
             )
 
-            # Redis
-            self.redis = redis.from_url(self.redis_url)
+            # Redis (the process-wide client, shared with the signal engine)
+            self.redis = get_redis()
             await self.redis.ping()
             logger.info("Connected to Redis.")
         except (asyncpg.PostgresError, OSError, asyncpg.exceptions.ConnectionDoesNotExistError) as e:
@@ -68,39 +94,37 @@ class SignalDB:
         """
         Fetch latest OHLCV bars from QuestDB.
 
-        Uses a parameterised query ($1) to prevent SQL injection on the symbol
-        parameter.  The ``limit`` value is a validated integer so it is safe to
-        interpolate directly into the query string.
+        Both the symbol and the limit are bind parameters, so the statement is
+        prepared once per pooled connection and reused on every call.
+
+        Results are cached for the rest of the current minute; repeated calls
+        in that minute return the cached rows without a database round trip.
         """
         if not self.quest_pool:
             return []
 
-        # Clamp limit to a safe, positive integer to avoid edge-case injection
-        # through the LIMIT clause (even though it is an internal parameter).
+        # Clamp limit to a sane positive range.
         safe_limit = max(1, min(int(limit), 1000))
 
-        query = f"""
-        SELECT
-            timestamp,
-            first(price) as open,
-            max(price)   as high,
-            min(price)   as low,
-            last(price)  as close,
-            sum(size)    as volume
-        FROM market_data
-        WHERE symbol = $1
-        SAMPLE BY 1m ALIGN TO CALENDAR
-        ORDER BY timestamp DESC
-        LIMIT {safe_limit}
-        """
+        bucket = int(time.time()) // 60
+        key = (symbol, safe_limit, bucket)
+        cached = self._ohlcv_cache.get(key)
+        if cached is not None:
+            return list(cached)
 
         try:
             async with self.quest_pool.acquire() as conn:
-                rows = await conn.fetch(query, symbol)
+                rows = await conn.fetch(_OHLCV_QUERY, symbol, safe_limit)
 
             # Convert to list of dicts and reverse to chronological order (ASC)
             data = [dict(row) for row in rows]
-            return data[::-1]
+            data.reverse()
+
+            # Drop entries from earlier minutes before caching the new one.
+            for stale in [k for k in self._ohlcv_cache if k[2] < bucket]:
+                del self._ohlcv_cache[stale]
+            self._ohlcv_cache[key] = data
+            return list(data)
 
         except asyncpg.PostgresError as e:
             logger.error("DB error fetching OHLCV for %s: %s", symbol, e)
@@ -111,7 +135,7 @@ class SignalDB:
         if not self.redis:
             return
         try:
-            await self.redis.publish("trade_signals", json.dumps(payload))
+            await self.redis.publish("trade_signals", dumps(payload))
             logger.info("Published Signal: %s %s", payload['symbol'], payload['signal'])
         except redis.RedisError as e:
             logger.error("Failed to publish signal: %s", e)
@@ -6,19 +6,36 @@ import logging
 logger = logging.getLogger("TitanXAI")
 
 class XAIEngine:
-    def __init__(self, model, background_data):
+    def __init__(self, model, background_data, device=None):
         """
         Initialize SHAP Explainer.
         Args:
             model: PyTorch model (must have a forward method)
             background_data: Representative dataset (numpy array) for baseline (e.g., 100 samples)
+            device: torch device for the baseline and inputs (defaults to the model's)
         """
         self.model = model
-        # DeepExplainer is suitable for Deep Learning models
-        # We need to wrap the model to handle numpy inputs if necessary, 
-        # but shap.DeepExplainer supports torch tensors directly.
+        if device is None:
+            param = next(model.parameters(), None)
+            device = param.device if param is not None else torch.device("cpu")
+        self.device = torch.device(device)
+
+        # The baseline tensor is converted and moved to the device once and
+        # kept for the life of the engine, rather than per explanation.  A
+        # contiguous float32 array is shared as is, not copied.
+        background = torch.as_tensor(background_data, dtype=torch.float32).contiguous()
+        if self.device.type == "cuda":
+            background = background.pin_memory()
+        self.background = background.to(self.device, non_blocking=True)
+
+        # DeepExplainer is suitable for Deep Learning models and supports
+        # torch tensors directly.
         try:
-            self.explainer = shap.DeepExplainer(model, torch.from_numpy(background_data).float())
+            self.explainer = shap.DeepExplainer(model, self.background)
+            # One throwaway explanation pays the first-call costs (autograd
+            # graph setup, CUDA kernel/allocator warm-up) up front instead of
+            # on the first live signal.
+            self.explainer.shap_values(self.background[:1])
             logger.info("SHAP DeepExplainer initialized.")
         except Exception as e:
             logger.warning(f"Failed to init SHAP (Normal during dev without real data): {e}")
@@ -28,16 +45,15 @@ class XAIEngine:
         """
         Generate SHAP values for a single prediction.
         Args:
-            input_tensor: (1, Seq, Features)
+            input_tensor: (1, Seq, Features) tensor or numpy array
         Returns:
             shap_values: List of numpy arrays (one for each output class)
         """
         if not self.explainer:
             return None
 
-        # valid input check
-        if isinstance(input_tensor, np.ndarray):
-            input_tensor = torch.from_numpy(input_tensor).float()
+        # Shares memory with float32 CPU arrays/tensors already on the device.
+        input_tensor = torch.as_tensor(input_tensor, dtype=torch.float32, device=self.device)
 
         shap_values = self.explainer.shap_values(input_tensor)
         return shap_values
@@ -1,9 +1,175 @@
+import numpy as np
 import pandas as pd
-import ta
+from pandas.api.types import is_numeric_dtype
+
+try:
+    from numba import njit
+except ImportError:  # optional: the kernel also runs as plain Python
+    njit = None
+
+# Output columns of the indicator kernel, in kernel column order.
+FEATURE_COLUMNS = ['RSI', 'MACD', 'MACD_line', 'MACD_signal', 'log_ret', 'ATR', 'BBU', 'BBL', 'BBM']
+
+_RSI_WINDOW = 14
+_MACD_FAST, _MACD_SLOW, _MACD_SIGN = 12, 26, 9
+_ATR_WINDOW = 14
+_BB_WINDOW, _BB_DEV = 20, 2.0
+
+# Added to the per-column std in normalize() so flat columns don't divide by 0.
+_NORM_EPS = 1e-8
+
+
+def _indicator_kernel(high, low, close, out):
+    """
+    Fill ``out`` (n x len(FEATURE_COLUMNS)) with all indicators in one pass.
+
+    Reproduces the 'ta' library definitions (RSI/ATR with Wilder smoothing,
+    MACD from adjust=False EMAs, Bollinger Bands with population std, and
+    log_ret as a simple pct change) using scalar running accumulators, so no
+    intermediate Series are allocated.  Rows before an indicator's lookback
+    is satisfied are NaN, except ATR which 'ta' zero-fills.
+    """
+    n = close.shape[0]
+    nan = np.nan
+    a_rsi = 1.0 / _RSI_WINDOW
+    a_fast = 2.0 / (_MACD_FAST + 1)
+    a_slow = 2.0 / (_MACD_SLOW + 1)
+    a_sign = 2.0 / (_MACD_SIGN + 1)
+
+    ema_up = 0.0
+    ema_dn = 0.0
+    ema_fast = close[0] if n else 0.0
+    ema_slow = ema_fast
+    ema_sign = 0.0
+    n_sign = 0
+    atr = 0.0
+    tr_sum = 0.0
+    # Rolling sums for the Bollinger window, shifted by close[0] to limit
+    # cancellation in sum(x^2) - sum(x)^2 / w.
+    shift = ema_fast
+    bb_sum = 0.0
+    bb_sq = 0.0
+
+    for i in range(n):
+        c = close[i]
+
+        # --- RSI (Wilder EMA of gains/losses; first diff counts as 0) ---
+        if i > 0:
+            diff = c - close[i - 1]
+            up = diff if diff > 0.0 else 0.0
+            dn = -diff if diff < 0.0 else 0.0
+            ema_up = (1.0 - a_rsi) * ema_up + a_rsi * up
+            ema_dn = (1.0 - a_rsi) * ema_dn + a_rsi * dn
+        if i >= _RSI_WINDOW - 1:
+            out[i, 0] = 100.0 if ema_dn == 0.0 else 100.0 - 100.0 / (1.0 + ema_up / ema_dn)
+        else:
+            out[i, 0] = nan
+
+        # --- MACD line / signal / histogram ---
+        if i > 0:
+            ema_fast = (1.0 - a_fast) * ema_fast + a_fast * c
+            ema_slow = (1.0 - a_slow) * ema_slow + a_slow * c
+        if i >= _MACD_SLOW - 1:
+            macd = ema_fast - ema_slow
+            # The signal EMA starts at the first valid MACD value.
+            ema_sign = macd if n_sign == 0 else (1.0 - a_sign) * ema_sign + a_sign * macd
+            n_sign += 1
+            out[i, 2] = macd
+            if n_sign >= _MACD_SIGN:
+                out[i, 3] = ema_sign
+                out[i, 1] = macd - ema_sign
+            else:
+                out[i, 3] = nan
+                out[i, 1] = nan
+        else:
+            out[i, 1] = nan
+            out[i, 2] = nan
+            out[i, 3] = nan
+
+        # --- Simple return ---
+        out[i, 4] = c / close[i - 1] - 1.0 if i > 0 else nan
+
+        # --- ATR (Wilder; seeded with the mean of the first window) ---
+        tr = high[i] - low[i]
+        if i > 0:
+            prev = close[i - 1]
+            tr = max(tr, abs(high[i] - prev), abs(low[i] - prev))
+        if i < _ATR_WINDOW:
+            tr_sum += tr
+            if i == _ATR_WINDOW - 1:
+                atr = tr_sum / _ATR_WINDOW
+        else:
+            atr = (atr * (_ATR_WINDOW - 1) + tr) / _ATR_WINDOW
+        out[i, 5] = atr if i >= _ATR_WINDOW - 1 else 0.0
+
+        # --- Bollinger Bands (rolling mean, population std) ---
+        x = c - shift
+        bb_sum += x
+        bb_sq += x * x
+        if i >= _BB_WINDOW:
+            old = close[i - _BB_WINDOW] - shift
+            bb_sum -= old
+            bb_sq -= old * old
+        if i >= _BB_WINDOW - 1:
+            mean = bb_sum / _BB_WINDOW
+            var = bb_sq / _BB_WINDOW - mean * mean
+            std = np.sqrt(var) if var > 0.0 else 0.0
+            mavg = mean + shift
+            out[i, 6] = mavg + _BB_DEV * std
+            out[i, 7] = mavg - _BB_DEV * std
+            out[i, 8] = mavg
+        else:
+            out[i, 6] = nan
+            out[i, 7] = nan
+            out[i, 8] = nan
+
+
+# Compiled to machine code when numba is installed.  fastmath is left off:
+# the kernel relies on IEEE NaN semantics for the warm-up rows.
+_compute_indicators = njit(cache=True)(_indicator_kernel) if njit is not None else _indicator_kernel
+
+
+def _rsi_kernel(close, window, out):
+    """Wilder RSI over ``close`` into ``out``; NaN until ``window - 1``."""
+    a = 1.0 / window
+    ema_up = 0.0
+    ema_dn = 0.0
+    for i in range(close.shape[0]):
+        if i > 0:
+            diff = close[i] - close[i - 1]
+            up = diff if diff > 0.0 else 0.0
+            dn = -diff if diff < 0.0 else 0.0
+            ema_up = (1.0 - a) * ema_up + a * up
+            ema_dn = (1.0 - a) * ema_dn + a * dn
+        if i >= window - 1:
+            out[i] = 100.0 if ema_dn == 0.0 else 100.0 - 100.0 / (1.0 + ema_up / ema_dn)
+        else:
+            out[i] = np.nan
+
+
+_compute_rsi = njit(cache=True)(_rsi_kernel) if njit is not None else _rsi_kernel
+
+
+def rsi(close, window: int = _RSI_WINDOW) -> np.ndarray:
+    """
+    Wilder RSI of a close-price sequence, matching ta.momentum.rsi.
+
+    For strategies that need RSI with a non-default window without the full
+    feature set.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    out = np.empty(close.shape[0], dtype=np.float64)
+    _compute_rsi(close, window, out)
+    return out
+
 
 class FeatureEngineer:
     """
-    Computes technical indicators and features for ML models using 'ta' library.
+    Computes technical indicators and features for ML models.
+
+    All indicators are produced by a single fused kernel over the raw OHLC
+    arrays (numba-compiled when available) with the same definitions as the
+    'ta' library.
     """
     def __init__(self):
         pass
@@ -15,35 +181,102 @@ class FeatureEngineer:
         """
         if df.empty:
             return df
-            
-        df = df.copy()
-        
-        # Ensure numeric
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = pd.to_numeric(df[col])
-
-        # 1. RSI (14)
-        df['RSI'] = ta.momentum.rsi(df['close'], window=14)
-        
-        # 2. MACD (12, 26, 9)
-        # ta returns Series, need to merge manually or use add_all_ta_features (too heavy)
-        df['MACD'] = ta.trend.macd_diff(df['close'], window_slow=26, window_fast=12, window_sign=9)
-        df['MACD_line'] = ta.trend.macd(df['close'], window_slow=26, window_fast=12)
-        df['MACD_signal'] = ta.trend.macd_signal(df['close'], window_slow=26, window_fast=12, window_sign=9)
-
-        # 3. Log Returns
-        df['log_ret'] = df['close'].pct_change()
-        
-        # 4. Volatility (ATR 14)
-        df['ATR'] = ta.volatility.average_true_range(df['high'], df['low'], df['close'], window=14)
-        
-        # 5. Bollinger Bands (20, 2)
-        indicator_bb = ta.volatility.BollingerBands(close=df["close"], window=20, window_dev=2)
-        df['BBU'] = indicator_bb.bollinger_hband()
-        df['BBL'] = indicator_bb.bollinger_lband()
-        df['BBM'] = indicator_bb.bollinger_mavg()
-
-        # Drop NaN (caused by lookback windows)
-        df.dropna(inplace=True)
-        
+
+        # Ensure numeric (copying only if a column actually needs converting)
+        cols = ['open', 'high', 'low', 'close', 'volume']
+        to_convert = [col for col in cols if not is_numeric_dtype(df[col])]
+        if to_convert:
+            df = df.copy()
+            for col in to_convert:
+                df[col] = pd.to_numeric(df[col])
+
+        high = np.ascontiguousarray(df['high'].to_numpy(dtype=np.float64))
+        low = np.ascontiguousarray(df['low'].to_numpy(dtype=np.float64))
+        close = np.ascontiguousarray(df['close'].to_numpy(dtype=np.float64))
+
+        out = np.empty((len(close), len(FEATURE_COLUMNS)), dtype=np.float64)
+        _compute_indicators(high, low, close, out)
+
+        # Replace any stale feature columns.
+        stale = df.columns.intersection(FEATURE_COLUMNS)
+        if len(stale):
+            df = df.drop(columns=stale)
+
+        # Drop NaN rows (lookback windows, gaps in the input) before building
+        # the output, so only surviving rows are copied, and attach all
+        # feature columns in one concat.
+        keep = ~np.isnan(out).any(axis=1) & df.notna().all(axis=1).to_numpy()
+        df = pd.concat(
+            [df[keep], pd.DataFrame(out[keep], index=df.index[keep], columns=FEATURE_COLUMNS)],
+            axis=1,
+        )
+
         return df
+
+    @staticmethod
+    def normalize(df: pd.DataFrame, columns, lookback: int):
+        """
+        Standard-score the last ``lookback`` rows of ``columns``.
+
+        Scaled values are float32 (the models are float32).  Returns
+        (scaled, mean, std) where std already includes the epsilon, so
+        ``scaled * std + mean`` undoes the scaling.
+        """
+        return standardize(df[columns].to_numpy(dtype=np.float64)[-lookback:])
+
+
+def _standardize_kernel(window, out, mean, std):
+    """
+    Per-column z-score of ``window`` into ``out`` in three row-major passes:
+    column sums, then centred sums of squares (two-pass variance, as stable
+    as Welford without a division per element), then the scaled values,
+    multiplied by a per-column reciprocal of std rather than divided.
+    Walking rows in memory order lets the column loop vectorize.
+    """
+    rows, cols = window.shape
+    inv_rows = 1.0 / rows
+    for j in range(cols):
+        mean[j] = 0.0
+        std[j] = 0.0
+    for i in range(rows):
+        for j in range(cols):
+            mean[j] += window[i, j]
+    for j in range(cols):
+        mean[j] *= inv_rows
+    for i in range(rows):
+        for j in range(cols):
+            d = window[i, j] - mean[j]
+            std[j] += d * d
+    inv_std = np.empty(cols)
+    for j in range(cols):
+        std[j] = np.sqrt(std[j] * inv_rows) + _NORM_EPS
+        inv_std[j] = 1.0 / std[j]
+    for i in range(rows):
+        for j in range(cols):
+            out[i, j] = (window[i, j] - mean[j]) * inv_std[j]
+
+
+# No NaN handling is needed here, so fastmath is safe for this kernel.
+_compute_standardize = (
+    njit(cache=True, fastmath=True)(_standardize_kernel) if njit is not None
+    else _standardize_kernel
+)
+
+
+def standardize(window, out=None):
+    """
+    Standard-score a (rows, features) window per column.
+
+    Statistics are accumulated in float64; the scaled values are written
+    to ``out`` (a float32 array of the same shape, allocated when omitted)
+    so callers can reuse one scratch buffer per model.  Returns
+    (scaled, mean, std) like FeatureEngineer.normalize.
+    """
+    window = np.ascontiguousarray(window, dtype=np.float64)
+    if out is None:
+        out = np.empty(window.shape, dtype=np.float32)
+    cols = window.shape[1]
+    mean = np.empty(cols, dtype=np.float64)
+    std = np.empty(cols, dtype=np.float64)
+    _compute_standardize(window, out, mean, std)
+    return out, mean, std
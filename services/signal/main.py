@@ -1,9 +1,7 @@
 import asyncio
-import json
 import logging
 import os
 import sys
-import redis.asyncio as redis
 from dotenv import load_dotenv
 
 # Strategies
@@ -13,10 +11,15 @@ from strategies.lstm_strategy import LSTMStrategy
 from strategies.tft_strategy import TFTStrategy
 from strategies.logistic_regression_strategy import LogisticRegressionStrategy
 from strategies.random_forest_strategy import RandomForestStrategy
+from model import configure_cpu_threads
 
 # Shared schemas and health server
 from schemas import MarketDataEvent, TradeSignalEvent, validate_and_log, SCHEMA_VERSION
 from health import run_health_server, set_ready
+from tick_codec import TICK_CHANNEL, unpack_tick
+from serialization import dumps
+from redis_client import get_redis
+from publisher import BatchedPublisher
 
 load_dotenv()
 
@@ -27,9 +30,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger("TitanSignalService")
 
+# Ticks per symbol received but not yet run through its strategies.  A full
+# queue holds up the pubsub reader rather than dropping ticks, since the
+# online indicator state needs every bar.
+_SYMBOL_QUEUE_MAX = int(os.getenv("SIGNAL_SYMBOL_QUEUE_MAX", "1024"))
+
+
+async def symbol_worker(symbol, queue: asyncio.Queue, strategies, publisher):
+    """Run every strategy for ``symbol`` over its queued ticks, in order."""
+    get = queue.get
+    task_done = queue.task_done
+    publish_nowait = publisher.publish_nowait
+    while True:
+        raw = await get()
+        try:
+            for strategy in strategies:
+                signal = await strategy.on_tick(raw)
+                if not signal:
+                    continue
+
+                # Stamp schema_version before publishing
+                signal.setdefault("schema_version", SCHEMA_VERSION)
+
+                # Validate outgoing signal before publishing
+                validated = validate_and_log(
+                    TradeSignalEvent, signal, context="signal:publish:trade_signals"
+                )
+                if validated is None:
+                    logger.warning("Dropping malformed signal from %s", strategy)
+                    continue
+
+                logger.info(f"Signal Generated: {signal}")
+                publish_nowait("trade_signals", dumps(validated.to_dict()))
+        except Exception as e:
+            logger.error(f"Error processing {symbol} tick: {e}")
+        finally:
+            task_done()
+
+
 async def run_signal_engine(redis_client):
     logger.info("Initializing Signal Engine...")
-    
+    logger.info("Torch CPU inference threads: %d", configure_cpu_threads())
+
     # 1. Initialize Strategies
     # In a real app, load from DB/Config
     strategies = [
@@ -41,56 +83,66 @@ async def run_signal_engine(redis_client):
         RandomForestStrategy({"symbol": "SPY", "model_id": "rf_spy_v1", "confidence_threshold": 0.62})
     ]
     
-    # 2. Subscribe to Market Data
+    # One long-lived worker and tick queue per symbol: the pubsub reader
+    # only decodes and routes, and symbols don't wait behind each other's
+    # strategies.
+    strategies_by_symbol = {}
+    for strategy in strategies:
+        strategies_by_symbol.setdefault(strategy.symbol, []).append(strategy)
+
+    # Signals from one tick (and any burst behind it) go out in one pipeline.
+    publisher = BatchedPublisher(redis_client)
+    publisher.start()
+
+    queues = {}
+    workers = []
+    for symbol, symbol_strategies in strategies_by_symbol.items():
+        queues[symbol] = asyncio.Queue(maxsize=_SYMBOL_QUEUE_MAX)
+        workers.append(asyncio.create_task(
+            symbol_worker(symbol, queues[symbol], symbol_strategies, publisher)
+        ))
+
+    # 2. Subscribe to Market Data (packed binary ticks; see tick_codec)
     pubsub = redis_client.pubsub()
-    await pubsub.subscribe("market_data")
+    await pubsub.subscribe(TICK_CHANNEL)
     logger.info(f"Loaded {len(strategies)} strategies. Listening for market data...")
 
     set_ready(True)
 
+    get_queue = queues.get
     async for message in pubsub.listen():
         try:
             if message.get("type") != "message":
                 continue
 
-            raw = json.loads(message["data"])
+            raw = unpack_tick(message["data"])
 
             # Validate incoming market data event
             market_event = validate_and_log(MarketDataEvent, raw, context="signal:consume:market_data")
             if market_event is None:
                 continue
 
-            # 3. Process Tick
+            # 3. Route the tick to its symbol's worker
             if market_event.type == "trade":
-                for strategy in strategies:
-                    if strategy.symbol == market_event.symbol:
-                        signal = await strategy.on_tick(raw)
-
-                        if signal:
-                            # Stamp schema_version before publishing
-                            signal.setdefault("schema_version", SCHEMA_VERSION)
-
-                            # Validate outgoing signal before publishing
-                            validated = validate_and_log(
-                                TradeSignalEvent, signal, context="signal:publish:trade_signals"
-                            )
-                            if validated is None:
-                                logger.warning("Dropping malformed signal from %s", strategy)
-                                continue
-
-                            logger.info(f"Signal Generated: {signal}")
-                            await redis_client.publish(
-                                "trade_signals", json.dumps(validated.to_dict())
-                            )
+                queue = get_queue(market_event.symbol)
+                if queue is not None:
+                    await queue.put(raw)
 
         except Exception as e:
             logger.error(f"Error processing tick: {e}")
 
+    # Subscription ended: finish queued ticks, then flush pending signals.
+    for queue in queues.values():
+        await queue.join()
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    await publisher.close()
+
 async def main():
     logger.info("Starting TitanFlow SignalEngine...")
-    redis_host = os.getenv("REDIS_HOST", "redis")
-    redis_client = redis.from_url(f"redis://{redis_host}:6379")
-    
+    redis_client = get_redis()
+
     try:
         await redis_client.ping()
         logger.info("Connected to Redis.")
@@ -1,6 +1,12 @@
 import torch
 import torch.nn as nn
 import logging
+import os
+
+try:
+    import onnxruntime as ort
+except ImportError:  # optional: ONNX Runtime inference path
+    ort = None
 
 logger = logging.getLogger("TitanModel")
 
@@ -32,12 +38,14 @@ class HybridModel(nn.Module):
         # Concatenate: LSTM_last_hidden (hidden_dim) + CNN_out (64) + Transformer_pool (hidden_dim)
         fusion_dim = hidden_dim + 64 + hidden_dim
         
+        # Emits raw logits; see predict_proba() when probabilities are needed.
+        # Argmax and class ranking are unchanged by softmax, so the hot path
+        # can skip it.
         self.classifier = nn.Sequential(
             nn.Linear(fusion_dim, 128),
             nn.ReLU(),
             nn.Dropout(0.3),
             nn.Linear(128, num_classes), # [Buy, Hold, Sell]
-            nn.Softmax(dim=1)
         )
 
     def forward(self, x):
@@ -64,7 +72,107 @@ class HybridModel(nn.Module):
         
         return logits
 
-def load_model(path: str = None, input_dim: int = 8):
+def predict_proba(model, x):
+    """Class probabilities [Buy, Hold, Sell] for a batch (softmax over logits)."""
+    return torch.softmax(model(x), dim=-1)
+
+
+def _default_threads() -> int:
+    return int(os.getenv("TORCH_NUM_THREADS", "0")) or max(1, (os.cpu_count() or 1) // 2)
+
+
+def configure_cpu_threads(num_threads: int = None) -> int:
+    """
+    Size torch's CPU thread pools for this process.  Call once at startup,
+    before the first forward pass.
+
+    Intra-op threads default to half the cores (TORCH_NUM_THREADS
+    overrides) so the one-sample forwards issued from the event loop don't
+    oversubscribe the CPU; inter-op parallelism is pinned to one thread.
+    Returns the intra-op thread count.
+    """
+    if num_threads is None:
+        num_threads = _default_threads()
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only settable before any inter-op work has started.
+        logger.warning("torch inter-op thread pool already started; leaving it as is.")
+    torch.backends.mkldnn.enabled = True
+    return num_threads
+
+
+def optimize_for_inference(model: nn.Module, input_dim: int, seq_len: int = 60):
+    """
+    Trace an eval-mode model to TorchScript and freeze it for CPU inference.
+
+    Tracing removes per-op Python dispatch and freezing folds BatchNorm and
+    constants so oneDNN can fuse the conv/linear ops.  The result has no
+    nn.Module hooks, so keep the eager model for SHAP explanations.
+    """
+    example = torch.zeros(1, seq_len, input_dim)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+    return torch.jit.optimize_for_inference(traced)
+
+
+def quantize_dynamic_int8(model: nn.Module) -> nn.Module:
+    """
+    Dynamically quantize LSTM and Linear weights to int8 for CPU inference
+    (FBGEMM int8 GEMM; activations stay float).  Check output drift against
+    the float model before deploying new weights.
+    """
+    return torch.quantization.quantize_dynamic(model, {nn.LSTM, nn.Linear}, dtype=torch.qint8)
+
+
+def export_onnx(
+    model: nn.Module,
+    path: str,
+    input_dim: int,
+    seq_len: int = 60,
+    output_name: str = "logits",
+):
+    """
+    Export an eval-mode sequence model (HybridModel by default) to ONNX with
+    a dynamic batch axis.  Input is named 'input' (batch, seq_len,
+    input_dim) and the output ``output_name``.
+    """
+    example = torch.zeros(1, seq_len, input_dim)
+    with torch.no_grad():
+        torch.onnx.export(
+            model, example, path,
+            input_names=["input"], output_names=[output_name],
+            dynamic_axes={"input": {0: "batch"}, output_name: {0: "batch"}},
+            opset_version=17,
+        )
+    logger.info(f"Exported {type(model).__name__} to ONNX at {path}")
+
+
+def load_onnx_session(path: str, num_threads: int = None):
+    """
+    Open an exported model in ONNX Runtime's CPU provider with every graph
+    optimization enabled (constant folding, LSTM/MatMul/bias fusion).
+
+    Run with ``session.run(None, {"input": batch})[0]`` where ``batch`` is a
+    float32 (N, seq_len, input_dim) array; no torch tensors involved.
+    """
+    if ort is None:
+        raise RuntimeError("onnxruntime is required for ONNX inference")
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.intra_op_num_threads = num_threads or _default_threads()
+    options.inter_op_num_threads = 1
+    return ort.InferenceSession(path, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def load_model(
+    path: str = None,
+    input_dim: int = 8,
+    seq_len: int = 60,
+    optimize: bool = False,
+    quantize: bool = False,
+):
     model = HybridModel(input_dim=input_dim)
     if path:
         try:
@@ -76,4 +184,10 @@ def load_model(path: str = None, input_dim: int = 8):
         logger.info("Initialized new HybridModel with random weights.")
     
     model.eval()
+    if quantize:
+        model = quantize_dynamic_int8(model)
+        logger.info("HybridModel LSTM/Linear layers quantized to int8.")
+    if optimize:
+        model = optimize_for_inference(model, input_dim, seq_len)
+        logger.info("HybridModel traced and frozen for inference.")
     return model
@@ -11,7 +11,14 @@ class PositionalEncoding(nn.Module):
         pe[:, 0::2] = torch.sin(position * div_term)
         pe[:, 1::2] = torch.cos(position * div_term)
         pe = pe.unsqueeze(0).transpose(0, 1)
-        self.register_buffer('pe', pe)
+        # Deterministic, so not saved: the table is sized to the model's
+        # sequence length rather than a generic 5000 rows.
+        self.register_buffer('pe', pe, persistent=False)
+
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        # Older checkpoints saved the full 5000-row table; it is rebuilt here.
+        state_dict.pop(prefix + 'pe', None)
+        super()._load_from_state_dict(state_dict, prefix, *args, **kwargs)
 
     def forward(self, x):
         return x + self.pe[:x.size(0), :]
@@ -21,11 +28,13 @@ class TFTModel(nn.Module):
     Simplified Transformer for Time Series Forecasting (MVP for TFT).
     Uses standard TransformerEncoder.
     """
-    def __init__(self, input_size=14, d_model=64, nhead=4, num_layers=2, output_horizon=5, dropout=0.1):
+    def __init__(self, input_size=14, d_model=64, nhead=4, num_layers=2, output_horizon=5, dropout=0.1, max_len=5000):
         super(TFTModel, self).__init__()
         
         self.input_embedding = nn.Linear(input_size, d_model)
-        self.pos_encoder = PositionalEncoding(d_model)
+        # max_len: longest input sequence; pass the lookback to keep the
+        # positional table no larger than what forward() reads.
+        self.pos_encoder = PositionalEncoding(d_model, max_len=max_len)
         
         encoder_layers = nn.TransformerEncoderLayer(d_model, nhead, dim_feedforward=d_model*4, dropout=dropout)
         self.transformer_encoder = nn.TransformerEncoder(encoder_layers, num_layers)
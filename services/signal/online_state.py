@@ -0,0 +1,196 @@
+"""
+Streaming per-symbol feature state.
+
+OnlineFeatures advances every indicator produced by
+FeatureEngineer.calculate_features by one bar in O(1) instead of rebuilding
+a DataFrame and recomputing the whole history on each tick.  The update
+arithmetic mirrors feature_engineering._indicator_kernel step for step, so
+a stream of bars yields the same rows as one batch call over that history.
+The per-bar update is a numba-compiled kernel over small state arrays when
+numba is installed (plain Python otherwise).
+
+Complete feature rows (OHLCV followed by FEATURE_COLUMNS, i.e. the rows that
+survive calculate_features' dropna) are written to a ring buffer that
+stores every row twice, ``capacity`` slots apart, so the latest ``n`` rows
+are always one contiguous slice and window() never needs np.roll or a
+concatenate.
+"""
+from typing import Optional
+
+import numpy as np
+
+from feature_engineering import (
+    FEATURE_COLUMNS,
+    _ATR_WINDOW,
+    _BB_DEV,
+    _BB_WINDOW,
+    _MACD_FAST,
+    _MACD_SIGN,
+    _MACD_SLOW,
+    _RSI_WINDOW,
+)
+
+try:
+    from numba import njit
+except ImportError:  # optional: the update also runs as plain Python
+    njit = None
+
+# Column order of window() rows.
+ROW_COLUMNS = ['open', 'high', 'low', 'close', 'volume'] + FEATURE_COLUMNS
+CLOSE_IDX = ROW_COLUMNS.index('close')
+# Columns of a window() row holding the FEATURE_COLUMNS indicators.
+FEATURES = slice(len(ROW_COLUMNS) - len(FEATURE_COLUMNS), None)
+
+_A_RSI = 1.0 / _RSI_WINDOW
+_A_FAST = 2.0 / (_MACD_FAST + 1)
+_A_SLOW = 2.0 / (_MACD_SLOW + 1)
+_A_SIGN = 2.0 / (_MACD_SIGN + 1)
+
+# Slots of the float64 accumulator array.
+_PREV, _UP, _DN, _FAST, _SLOW, _SIGN, _ATR, _TR_SUM, _SHIFT, _BB_SUM, _BB_SQ = range(11)
+# Slots of the int64 counter array.
+_N, _N_SIGN, _POS, _FILLED = range(4)
+
+
+def _update_kernel(acc, cnt, bb_closes, rows, capacity, open_, high, low, c, volume):
+    """
+    Advance every indicator by one bar, mutating ``acc``/``cnt`` in place,
+    and write the row to the ring once all indicators are valid.
+    """
+    i = cnt[_N]
+    prev = acc[_PREV]
+
+    if i == 0:
+        acc[_FAST] = c
+        acc[_SLOW] = c
+        acc[_SHIFT] = c
+    else:
+        diff = c - prev
+        up = diff if diff > 0.0 else 0.0
+        dn = -diff if diff < 0.0 else 0.0
+        acc[_UP] = (1.0 - _A_RSI) * acc[_UP] + _A_RSI * up
+        acc[_DN] = (1.0 - _A_RSI) * acc[_DN] + _A_RSI * dn
+        acc[_FAST] = (1.0 - _A_FAST) * acc[_FAST] + _A_FAST * c
+        acc[_SLOW] = (1.0 - _A_SLOW) * acc[_SLOW] + _A_SLOW * c
+
+    # MACD signal EMA starts at the first valid MACD value.
+    macd = 0.0
+    if i >= _MACD_SLOW - 1:
+        macd = acc[_FAST] - acc[_SLOW]
+        if cnt[_N_SIGN] == 0:
+            acc[_SIGN] = macd
+        else:
+            acc[_SIGN] = (1.0 - _A_SIGN) * acc[_SIGN] + _A_SIGN * macd
+        cnt[_N_SIGN] += 1
+
+    tr = high - low
+    if i > 0:
+        tr = max(tr, abs(high - prev), abs(low - prev))
+    if i < _ATR_WINDOW:
+        acc[_TR_SUM] += tr
+        if i == _ATR_WINDOW - 1:
+            acc[_ATR] = acc[_TR_SUM] / _ATR_WINDOW
+    else:
+        acc[_ATR] = (acc[_ATR] * (_ATR_WINDOW - 1) + tr) / _ATR_WINDOW
+
+    # Bollinger window: last _BB_WINDOW closes, with sums shifted by the
+    # first close exactly as in the batch kernel.
+    slot = i % _BB_WINDOW
+    shift = acc[_SHIFT]
+    x = c - shift
+    acc[_BB_SUM] += x
+    acc[_BB_SQ] += x * x
+    if i >= _BB_WINDOW:
+        old = bb_closes[slot] - shift
+        acc[_BB_SUM] -= old
+        acc[_BB_SQ] -= old * old
+    bb_closes[slot] = c
+
+    cnt[_N] = i + 1
+    acc[_PREV] = c
+
+    # Every indicator is valid once the MACD signal line is.
+    if cnt[_N_SIGN] < _MACD_SIGN:
+        return
+
+    ema_dn = acc[_DN]
+    rsi = 100.0 if ema_dn == 0.0 else 100.0 - 100.0 / (1.0 + acc[_UP] / ema_dn)
+    mean = acc[_BB_SUM] / _BB_WINDOW
+    var = acc[_BB_SQ] / _BB_WINDOW - mean * mean
+    std = np.sqrt(var) if var > 0.0 else 0.0
+    mavg = mean + shift
+    sign = acc[_SIGN]
+
+    # Each row is stored twice, capacity slots apart.
+    pos = cnt[_POS]
+    for r in (pos, pos + capacity):
+        row = rows[r]
+        row[0] = open_
+        row[1] = high
+        row[2] = low
+        row[3] = c
+        row[4] = volume
+        row[5] = rsi
+        row[6] = macd - sign
+        row[7] = macd
+        row[8] = sign
+        row[9] = c / prev - 1.0
+        row[10] = acc[_ATR]
+        row[11] = mavg + _BB_DEV * std
+        row[12] = mavg - _BB_DEV * std
+        row[13] = mavg
+    cnt[_POS] = (pos + 1) % capacity
+    if cnt[_FILLED] < capacity:
+        cnt[_FILLED] += 1
+
+
+# Compiled eagerly (explicit signature) so the JIT cost is paid at import,
+# not on the first live tick.  fastmath is left off to keep bitwise parity
+# with _indicator_kernel.
+_compute_update = (
+    njit(
+        "void(float64[::1], int64[::1], float64[::1], float64[:, ::1], int64,"
+        " float64, float64, float64, float64, float64)",
+        cache=True,
+    )(_update_kernel)
+    if njit is not None
+    else _update_kernel
+)
+
+
+class OnlineFeatures:
+    """Incrementally maintained feature rows for one symbol."""
+
+    def __init__(self, capacity: int = 200):
+        self.capacity = capacity
+        self._rows = np.empty((2 * capacity, len(ROW_COLUMNS)), dtype=np.float64)
+        self._acc = np.zeros(11, dtype=np.float64)   # indicator accumulators
+        self._cnt = np.zeros(4, dtype=np.int64)      # bars seen, ring position, ...
+        self._bb_closes = np.zeros(_BB_WINDOW, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return int(self._cnt[_FILLED])
+
+    @property
+    def bars_seen(self) -> int:
+        """Bars passed to update() so far, complete or not."""
+        return int(self._cnt[_N])
+
+    def update(self, open_: float, high: float, low: float, close: float, volume: float) -> None:
+        """Advance every indicator by one bar and store the row once complete."""
+        _compute_update(
+            self._acc, self._cnt, self._bb_closes, self._rows, self.capacity,
+            float(open_), float(high), float(low), float(close), float(volume),
+        )
+
+    def window(self, n: int) -> Optional[np.ndarray]:
+        """
+        Latest ``n`` complete rows, oldest first, as a read-only view
+        (ROW_COLUMNS order).  None until ``n`` rows are available.
+        """
+        if n > self._cnt[_FILLED] or n <= 0:
+            return None
+        end = int(self._cnt[_POS]) + self.capacity
+        view = self._rows[end - n:end]
+        view.flags.writeable = False
+        return view
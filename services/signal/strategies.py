@@ -5,8 +5,8 @@ from dataclasses import dataclass
 from typing import List
 
 import numpy as np
-import pandas as pd
-import ta
+
+from feature_engineering import rsi as wilder_rsi
 
 
 @dataclass
@@ -48,16 +48,19 @@ class SMACrossover(Strategy):
         if len(bars) < (self.long_window + 1):
             return None
 
-        closes = pd.Series([float(row["close"]) for row in bars], dtype=float)
-        short_sma = closes.rolling(self.short_window).mean()
-        long_sma = closes.rolling(self.long_window).mean()
-        if pd.isna(short_sma.iloc[-1]) or pd.isna(long_sma.iloc[-1]):
+        # Only the last two values of each SMA are needed, so average the
+        # tail slices directly instead of rolling over the whole history.
+        count = self.long_window + 1
+        closes = np.fromiter(
+            (float(row["close"]) for row in bars[-count:]), dtype=float, count=count
+        )
+        short_curr = float(closes[-self.short_window:].mean())
+        long_curr = float(closes[-self.long_window:].mean())
+        if np.isnan(short_curr) or np.isnan(long_curr):
             return None
 
-        short_prev = float(short_sma.iloc[-2])
-        long_prev = float(long_sma.iloc[-2])
-        short_curr = float(short_sma.iloc[-1])
-        long_curr = float(long_sma.iloc[-1])
+        short_prev = float(closes[-self.short_window - 1:-1].mean())
+        long_prev = float(closes[:-1].mean())
         if long_curr == 0:
             return None
 
@@ -98,13 +101,13 @@ class RSIMeanReversion(Strategy):
         if len(bars) < (self.window + 2):
             return None
 
-        closes = pd.Series([float(row["close"]) for row in bars], dtype=float)
-        rsi = ta.momentum.RSIIndicator(close=closes, window=self.window).rsi()
-        if rsi.isna().iloc[-1]:
+        closes = np.fromiter((float(row["close"]) for row in bars), dtype=float, count=len(bars))
+        rsi = wilder_rsi(closes, self.window)
+        if np.isnan(rsi[-1]):
             return None
 
-        rsi_curr = float(rsi.iloc[-1])
-        rsi_prev = float(rsi.iloc[-2]) if not np.isnan(rsi.iloc[-2]) else rsi_curr
+        rsi_curr = float(rsi[-1])
+        rsi_prev = float(rsi[-2]) if not np.isnan(rsi[-2]) else rsi_curr
 
         if rsi_curr <= self.oversold:
             pressure = (self.oversold - rsi_curr) / max(self.oversold, 1.0)
@@ -3,28 +3,30 @@ import os
 import numpy as np
 import pandas as pd
 import lightgbm as lgb
-import shap
-from typing import Dict, Any, Optional, Deque
-from collections import deque
+from typing import Dict, Any, Optional
 from .base import Strategy
-from feature_engineering import FeatureEngineer
+from online_state import ROW_COLUMNS, OnlineFeatures
 
 logger = logging.getLogger("TitanLightGBM")
 
 class LightGBMStrategy(Strategy):
     """
     ML Strategy using LightGBM for classification (Up/Down).
-    Includes SHAP explainability.
+    Includes SHAP explainability (LightGBM's native TreeSHAP).
     """
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.fe = FeatureEngineer()
         self.model = None
-        self.explainer = None
         self._disabled = False
-        # Rolling window for feature calculation (need ~50 bars for indicators)
-        self.bars = deque(maxlen=200)
-        self.min_bars = 60  # Min bars needed to calc features
+        # Incrementally updated feature rows; only the newest one is scored,
+        # so each tick costs one O(1) indicator update instead of a rebuild
+        # over the whole bar history.
+        self.features = OnlineFeatures(capacity=1)
+        self.min_bars = 60  # Min bars before scoring
+        self._warm = False
+        # Names for explanation output, resolved once: the booster's own
+        # feature names once a model is loaded.
+        self._feature_names = list(ROW_COLUMNS)
 
         # Hyperparams
         self.confidence_threshold = config.get("confidence_threshold", 0.6)
@@ -54,38 +56,43 @@ class LightGBMStrategy(Strategy):
 
         logger.info("Loading LightGBM model from %s...", self.model_path)
         self.model = lgb.Booster(model_file=self.model_path)
-
-        # Initialize Explainer
-        self.explainer = shap.TreeExplainer(self.model)
+        self._feature_names = self.model.feature_name()
         self._disabled = False
-        logger.info("LightGBM model loaded & SHAP explainer initialised.")
-
-    async def on_tick(self, tick: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        # Return immediately if model weights were never loaded.
-        if self._disabled or self.model is None:
-            return None
-
-        price = float(tick.get("price", 0.0))
-        if price <= 0:
-            return None
-
-        # Append tick as a synthetic bar (OHLC all equal) for feature calculation.
-        # A proper bar aggregator should replace this in production.
-        self.bars.append({
-            'open': price, 'high': price, 'low': price, 'close': price, 'volume': 100
-        })
+        logger.info("LightGBM model loaded.")
+
+    def _last_row(self) -> Optional[pd.DataFrame]:
+        """Newest feature row in training column order, or None while warming up."""
+        if not self._warm:
+            # Warm-up only ends once, so later ticks skip these checks.
+            if self.features.bars_seen < self.min_bars or not len(self.features):
+                return None
+            self._warm = True
+        return pd.DataFrame(self.features.window(1), columns=ROW_COLUMNS)
+
+    def _explain(self, last_row: pd.DataFrame) -> list:
+        """
+        Top-3 SHAP contributions for the scored row.
 
-        if len(self.bars) < self.min_bars:
-            return None
+        Booster.predict(pred_contrib=True) runs LightGBM's exact TreeSHAP in
+        C++ (the values shap.TreeExplainer would return); the final column
+        is the expected value and is dropped.
+        """
+        try:
+            vals = self.model.predict(last_row, pred_contrib=True)[0][:-1]
+            top = np.argpartition(np.abs(vals), -3)[-3:]
+            top = top[np.argsort(np.abs(vals[top]))[::-1]]
+            feature_names = self._feature_names
+            return [f"{feature_names[i]}: {vals[i]:.4f}" for i in top]
+        except Exception as exc:
+            logger.warning("SHAP explanation failed for %s: %s", self.symbol, exc)
+            return []
 
-        # Convert to DF and calculate features
-        df = pd.DataFrame(list(self.bars))
-        features_df = self.fe.calculate_features(df)
-        if features_df.empty:
+    def _infer(self, price: float, timestamp) -> Optional[Dict[str, Any]]:
+        """Score the newest feature row and build the signal, if any."""
+        last_row = self._last_row()
+        if last_row is None:
             return None
 
-        last_row = features_df.iloc[[-1]]
-
         # Run inference; catch runtime errors so one bad tick doesn't crash the loop.
         try:
             prob = self.model.predict(last_row)[0]  # Probability of Class 1 (UP)
@@ -101,20 +108,7 @@ class LightGBMStrategy(Strategy):
 
         if signal:
             # SHAP explanation
-            try:
-                shap_values = self.explainer.shap_values(last_row)
-                if isinstance(shap_values, list):
-                    vals = shap_values[1][0]
-                else:
-                    vals = shap_values[0]
-                feature_names = last_row.columns.tolist()
-                top_indices = np.argsort(np.abs(vals))[-3:][::-1]
-                explanation = [
-                    f"{feature_names[i]}: {vals[i]:.4f}" for i in top_indices
-                ]
-            except Exception as exc:
-                logger.warning("SHAP explanation failed for %s: %s", self.symbol, exc)
-                explanation = []
+            explanation = self._explain(last_row)
 
             # 1-hour forecast: project price using ATR and confidence
             atr = float(last_row['ATR'].iloc[0]) if 'ATR' in last_row.columns else price * 0.005
@@ -122,8 +116,7 @@ class LightGBMStrategy(Strategy):
             direction = 1.0 if signal == "BUY" else -1.0
             forecast_price = round(price + direction * atr * conf * 2.0, 2)
 
-            current_ts = tick.get("timestamp", 0)
-            forecast_timestamp = int(current_ts) + (60 * 60 * 1000)  # +1 hour in ms
+            forecast_timestamp = int(timestamp) + (60 * 60 * 1000)  # +1 hour in ms
 
             return {
                 "model_id": self.model_id,
@@ -132,7 +125,7 @@ class LightGBMStrategy(Strategy):
                 "signal": signal,
                 "confidence": round(conf, 2),
                 "price": price,
-                "timestamp": current_ts,
+                "timestamp": timestamp,
                 "explanation": explanation,
                 "forecast_price": forecast_price,
                 "forecast_timestamp": forecast_timestamp
@@ -140,80 +133,36 @@ class LightGBMStrategy(Strategy):
 
         return None
 
-    async def on_bar(self, bar: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Process a real OHLCV bar from the Gateway."""
+    async def on_tick(self, tick: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # Return immediately if model weights were never loaded.
         if self._disabled or self.model is None:
             return None
 
-        close = float(bar.get("close", 0.0))
-        if close <= 0:
+        price = float(tick.get("price", 0.0))
+        if price <= 0:
             return None
 
-        self.bars.append({
-            "open": float(bar.get("open", close)),
-            "high": float(bar.get("high", close)),
-            "low": float(bar.get("low", close)),
-            "close": close,
-            "volume": float(bar.get("volume", 0)),
-        })
+        # Append tick as a synthetic bar (OHLC all equal) for feature calculation.
+        # A proper bar aggregator should replace this in production.
+        self.features.update(price, price, price, price, 100.0)
 
-        if len(self.bars) < self.min_bars:
-            return None
+        return self._infer(price, tick.get("timestamp", 0))
 
-        df = pd.DataFrame(list(self.bars))
-        features_df = self.fe.calculate_features(df)
-        if features_df.empty:
+    async def on_bar(self, bar: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Process a real OHLCV bar from the Gateway."""
+        if self._disabled or self.model is None:
             return None
 
-        last_row = features_df.iloc[[-1]]
-
-        try:
-            prob = self.model.predict(last_row)[0]
-        except Exception as exc:
-            logger.error("LightGBM inference failed for %s: %s", self.symbol, exc)
+        close = float(bar.get("close", 0.0))
+        if close <= 0:
             return None
 
-        signal = None
-        if prob > self.confidence_threshold:
-            signal = "BUY"
-        elif prob < (1 - self.confidence_threshold):
-            signal = "SELL"
-
-        if signal:
-            try:
-                shap_values = self.explainer.shap_values(last_row)
-                if isinstance(shap_values, list):
-                    vals = shap_values[1][0]
-                else:
-                    vals = shap_values[0]
-                feature_names = last_row.columns.tolist()
-                top_indices = np.argsort(np.abs(vals))[-3:][::-1]
-                explanation = [
-                    f"{feature_names[i]}: {vals[i]:.4f}" for i in top_indices
-                ]
-            except Exception as exc:
-                logger.warning("SHAP explanation failed for %s: %s", self.symbol, exc)
-                explanation = []
-
-            atr = float(last_row["ATR"].iloc[0]) if "ATR" in last_row.columns else close * 0.005
-            conf = float(prob if signal == "BUY" else 1 - prob)
-            direction = 1.0 if signal == "BUY" else -1.0
-            forecast_price = round(close + direction * atr * conf * 2.0, 2)
-
-            current_ts = bar.get("timestamp", 0)
-            forecast_timestamp = int(current_ts) + (60 * 60 * 1000)
+        self.features.update(
+            float(bar.get("open", close)),
+            float(bar.get("high", close)),
+            float(bar.get("low", close)),
+            close,
+            float(bar.get("volume", 0)),
+        )
 
-            return {
-                "model_id": self.model_id,
-                "model_name": "LightGBM_v1",
-                "symbol": self.symbol,
-                "signal": signal,
-                "confidence": round(conf, 2),
-                "price": close,
-                "timestamp": current_ts,
-                "explanation": explanation,
-                "forecast_price": forecast_price,
-                "forecast_timestamp": forecast_timestamp,
-            }
-
-        return None
+        return self._infer(close, bar.get("timestamp", 0))
@@ -1,15 +1,17 @@
 import logging
-from collections import deque
-from typing import Any, Deque, Dict, Optional
+from typing import Any, Dict, Optional
 
 import numpy as np
-import pandas as pd
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
 
-from feature_engineering import FeatureEngineer
+from online_state import CLOSE_IDX, FEATURES, ROW_COLUMNS, OnlineFeatures
 from .base import Strategy
 
+_RSI_IDX = ROW_COLUMNS.index("RSI")
+_MACD_IDX = ROW_COLUMNS.index("MACD")
+_ATR_IDX = ROW_COLUMNS.index("ATR")
+
 logger = logging.getLogger("TitanLogisticRegression")
 
 
@@ -18,8 +20,8 @@ class LogisticRegressionStrategy(Strategy):
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.fe = FeatureEngineer()
-        self.bars: Deque[Dict[str, float]] = deque(maxlen=config.get("buffer_size", 260))
+        # Incrementally updated feature rows for the last buffer_size bars.
+        self.features = OnlineFeatures(capacity=config.get("buffer_size", 260))
         self.min_bars = config.get("min_bars", 80)
         self.confidence_threshold = float(config.get("confidence_threshold", 0.58))
         self.retrain_every = int(config.get("retrain_every", 20))
@@ -30,32 +32,17 @@ class LogisticRegressionStrategy(Strategy):
         self.model_ready = False
 
     def _fit_model(self) -> None:
-        df = pd.DataFrame(list(self.bars))
-        feats = self.fe.calculate_features(df)
-        if len(feats) < 40:
+        rows = self.features.window(len(self.features))
+        if rows is None or len(rows) < 40:
             return
 
-        feats = feats.copy()
-        feats["target"] = (feats["close"].shift(-1) > feats["close"]).astype(int)
-        feats.dropna(inplace=True)
-        if feats["target"].nunique() < 2:
+        # Label each bar by the next bar's move; the newest bar has no label yet.
+        close = rows[:, CLOSE_IDX]
+        y = (close[1:] > close[:-1]).astype(int)
+        if len(np.unique(y)) < 2:
             return
 
-        feature_cols = [
-            "RSI",
-            "MACD",
-            "MACD_line",
-            "MACD_signal",
-            "log_ret",
-            "ATR",
-            "BBU",
-            "BBL",
-            "BBM",
-        ]
-        X = feats[feature_cols].to_numpy()
-        y = feats["target"].to_numpy()
-
-        X_scaled = self.scaler.fit_transform(X)
+        X_scaled = self.scaler.fit_transform(rows[:-1, FEATURES])
         self.model.fit(X_scaled, y)
         self.model_ready = True
 
@@ -64,8 +51,8 @@ class LogisticRegressionStrategy(Strategy):
         if price <= 0:
             return None
 
-        self.bars.append({"open": price, "high": price, "low": price, "close": price, "volume": 100})
-        if len(self.bars) < self.min_bars:
+        self.features.update(price, price, price, price, 100.0)
+        if self.features.bars_seen < self.min_bars:
             return None
 
         self._ticks_since_train += 1
@@ -76,13 +63,11 @@ class LogisticRegressionStrategy(Strategy):
         if not self.model_ready:
             return None
 
-        features_df = self.fe.calculate_features(pd.DataFrame(list(self.bars)))
-        if features_df.empty:
+        last = self.features.window(1)
+        if last is None:
             return None
 
-        last = features_df.iloc[[-1]]
-        feature_cols = ["RSI", "MACD", "MACD_line", "MACD_signal", "log_ret", "ATR", "BBU", "BBL", "BBM"]
-        X_last = self.scaler.transform(last[feature_cols].to_numpy())
+        X_last = self.scaler.transform(last[:, FEATURES])
         prob_up = float(self.model.predict_proba(X_last)[0][1])
 
         if prob_up > self.confidence_threshold:
@@ -94,7 +79,7 @@ class LogisticRegressionStrategy(Strategy):
         else:
             return None
 
-        atr = float(last["ATR"].iloc[0]) if "ATR" in last.columns else price * 0.005
+        atr = float(last[0, _ATR_IDX])
         direction = 1 if signal == "BUY" else -1
         forecast_price = round(price + direction * atr * confidence * 1.6, 2)
 
@@ -110,8 +95,8 @@ class LogisticRegressionStrategy(Strategy):
             "forecast_timestamp": int(tick.get("timestamp", 0)) + 60 * 60 * 1000,
             "explanation": [
                 f"ProbUp: {prob_up:.2f}",
-                f"RSI: {float(last['RSI'].iloc[0]):.1f}",
-                f"MACD: {float(last['MACD'].iloc[0]):.4f}",
+                f"RSI: {float(last[0, _RSI_IDX]):.1f}",
+                f"MACD: {float(last[0, _MACD_IDX]):.4f}",
             ],
         }
 
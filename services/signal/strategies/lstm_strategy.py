@@ -1,22 +1,17 @@
 import logging
+import os
+import tempfile
 import numpy as np
-import pandas as pd
 import torch
-from typing import Dict, Any, Optional, Deque
-from collections import deque
+from typing import Dict, Any, Optional
 from .base import Strategy
-from feature_engineering import FeatureEngineer
+from feature_engineering import standardize
+from online_state import OnlineFeatures, ROW_COLUMNS
 from models.lstm_model import LSTMModel
+from model import export_onnx, load_onnx_session, optimize_for_inference, quantize_dynamic_int8
 
 logger = logging.getLogger("TitanLSTM")
 
-# Expected feature columns that must be present for LSTM inference.
-_REQUIRED_FEATURES = [
-    'open', 'high', 'low', 'close', 'volume',
-    'RSI', 'MACD', 'MACD_line', 'MACD_signal',
-    'log_ret', 'ATR', 'BBU', 'BBL', 'BBM',
-]
-
 
 class LSTMStrategy(Strategy):
     """
@@ -28,20 +23,51 @@ class LSTMStrategy(Strategy):
         self.lookback = config.get("lookback", 60)
         self.device = torch.device("cpu")  # use cpu for inference in this container
 
-        # Data Buffer
         # We need enough data for feature engineering + lookback
         self.warmup_period = 200
-        self.prices: Deque[float] = deque(maxlen=self.warmup_period)
-        self.data_buffer: Deque[Dict] = deque(maxlen=self.warmup_period)
 
-        # Feature Engineering
-        self.fe = FeatureEngineer()
+        # Feature Engineering (incremental; rows follow ROW_COLUMNS order)
+        self.features = OnlineFeatures(capacity=self.warmup_period)
+        # Reused model-input scratch; inference finishes before the next tick.
+        # The model input tensor shares its memory, so no per-tick tensor
+        # is built.
+        self._batch = np.empty((1, self.lookback, len(ROW_COLUMNS)), dtype=np.float32)
+        self._scaled = self._batch[0]
+        self._tensor_in = torch.from_numpy(self._batch)  # [1, lookback, 14]
 
         # Model
         self.model = LSTMModel(input_size=14, hidden_size=64, num_layers=2)
         self.model.eval()
         # In a real scenario, we would load weights here:
         # self.model.load_state_dict(torch.load("lstm_weights.pth"))
+
+        # Optional ONNX Runtime backend ("onnx": True): the float model is
+        # exported once and each tick runs the optimized ORT graph on the
+        # numpy input buffer, bypassing torch entirely.
+        self._session = None
+        if config.get("onnx", False):
+            try:
+                path = os.path.join(tempfile.gettempdir(), f"lstm_{self.model_id}.onnx")
+                export_onnx(self.model, path, input_dim=14, seq_len=self.lookback, output_name="prob")
+                self._session = load_onnx_session(path)
+            except Exception as exc:
+                logger.warning("LSTM ONNX Runtime setup failed, using torch: %s", exc)
+
+        if self._session is None:
+            # int8 LSTM/Linear weights (FBGEMM GEMMs; activations stay float).
+            # Set "quantize": False to keep float32 when validating new weights.
+            if config.get("quantize", True):
+                try:
+                    self.model = quantize_dynamic_int8(self.model)
+                except Exception as exc:
+                    logger.warning("LSTM int8 quantization failed, using float model: %s", exc)
+
+            # Trace + freeze once so each tick runs the TorchScript graph
+            # instead of dispatching every LSTM/attention op from Python.
+            try:
+                self.model = optimize_for_inference(self.model, input_dim=14, seq_len=self.lookback)
+            except Exception as exc:
+                logger.warning("LSTM TorchScript optimisation failed, using eager model: %s", exc)
         logger.info(
             "Initialised LSTM Strategy for %s. Waiting for %d bars.",
             self.symbol, self.warmup_period,
@@ -54,52 +80,33 @@ class LSTMStrategy(Strategy):
         each entry as a synthetic bar close.
         """
         price = float(tick["price"])
-        self.prices.append(price)
-
-        if len(self.prices) < self.warmup_period:
+        if price <= 0:
             return None
+        # O/H/L/C are all set to price (tick-based simulation).  Indicators
+        # advance by one bar instead of being recomputed over the buffer.
+        self.features.update(price, price, price, price, 1000.0)
 
-        # Build DataFrame from recent prices to calculate indicators.
-        # O/H/L/C are all set to price (tick-based simulation).
-        df = pd.DataFrame({
-            "open":   list(self.prices),
-            "high":   list(self.prices),
-            "low":    list(self.prices),
-            "close":  list(self.prices),
-            "volume": [1000] * len(self.prices),
-        })
-
-        df = self.fe.calculate_features(df)
-        df.dropna(inplace=True)
-
-        if len(df) < self.lookback:
+        if self.features.bars_seen < self.warmup_period:
             return None
 
-        # Validate that all required feature columns are present before slicing.
-        missing = [c for c in _REQUIRED_FEATURES if c not in df.columns]
-        if missing:
-            logger.error(
-                "LSTM feature validation failed for %s: missing columns %s. "
-                "Check FeatureEngineer output.",
-                self.symbol, missing,
-            )
+        window = self.features.window(self.lookback)
+        if window is None:
             return None
 
-        recent_data = df[_REQUIRED_FEATURES].iloc[-self.lookback:].values
-
         # Normalize over the window (standard scaling).
-        mean = np.mean(recent_data, axis=0)
-        std = np.std(recent_data, axis=0) + 1e-8
-        scaled_data = (recent_data - mean) / std
+        scaled_data, _, _ = standardize(window, out=self._scaled)
 
-        tensor_in = torch.FloatTensor(scaled_data).unsqueeze(0).to(self.device)  # [1, 60, 14]
+        tensor_in = self._tensor_in  # view of self._batch (cpu)
 
         # Inference — catch runtime errors (shape mismatch, OOM, etc.) so a bad
         # tick does not crash the entire signal loop.
         try:
-            with torch.no_grad():
-                prediction = self.model(tensor_in).item()  # Probability 0..1
-        except RuntimeError as exc:
+            if self._session is not None:
+                prediction = float(self._session.run(None, {"input": self._batch})[0][0, 0])
+            else:
+                with torch.inference_mode():
+                    prediction = self.model(tensor_in).item()  # Probability 0..1
+        except Exception as exc:
             logger.error(
                 "LSTM inference failed for %s: %s. Input shape: %s",
                 self.symbol, exc, tensor_in.shape,
@@ -1,14 +1,15 @@
 import logging
-from collections import deque
-from typing import Any, Deque, Dict, Optional
+from typing import Any, Dict, Optional
 
 import numpy as np
-import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 
-from feature_engineering import FeatureEngineer
+from feature_engineering import FEATURE_COLUMNS
+from online_state import CLOSE_IDX, FEATURES, ROW_COLUMNS, OnlineFeatures
 from .base import Strategy
 
+_ATR_IDX = ROW_COLUMNS.index("ATR")
+
 logger = logging.getLogger("TitanRandomForest")
 
 
@@ -17,8 +18,8 @@ class RandomForestStrategy(Strategy):
 
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
-        self.fe = FeatureEngineer()
-        self.bars: Deque[Dict[str, float]] = deque(maxlen=config.get("buffer_size", 320))
+        # Incrementally updated feature rows for the last buffer_size bars.
+        self.features = OnlineFeatures(capacity=config.get("buffer_size", 320))
         self.min_bars = config.get("min_bars", 100)
         self.confidence_threshold = float(config.get("confidence_threshold", 0.62))
         self.retrain_every = int(config.get("retrain_every", 25))
@@ -33,21 +34,17 @@ class RandomForestStrategy(Strategy):
         )
 
     def _fit_model(self) -> None:
-        df = pd.DataFrame(list(self.bars))
-        feats = self.fe.calculate_features(df)
-        if len(feats) < 50:
+        rows = self.features.window(len(self.features))
+        if rows is None or len(rows) < 50:
             return
 
-        feats = feats.copy()
-        feats["target"] = (feats["close"].shift(-1) > feats["close"]).astype(int)
-        feats.dropna(inplace=True)
-        if feats["target"].nunique() < 2:
+        # Label each bar by the next bar's move; the newest bar has no label yet.
+        close = rows[:, CLOSE_IDX]
+        y = (close[1:] > close[:-1]).astype(int)
+        if len(np.unique(y)) < 2:
             return
 
-        feature_cols = ["RSI", "MACD", "MACD_line", "MACD_signal", "log_ret", "ATR", "BBU", "BBL", "BBM"]
-        X = feats[feature_cols].to_numpy()
-        y = feats["target"].to_numpy()
-        self.model.fit(X, y)
+        self.model.fit(rows[:-1, FEATURES], y)
         self.model_ready = True
 
     async def on_tick(self, tick: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -55,8 +52,8 @@ class RandomForestStrategy(Strategy):
         if price <= 0:
             return None
 
-        self.bars.append({"open": price, "high": price, "low": price, "close": price, "volume": 100})
-        if len(self.bars) < self.min_bars:
+        self.features.update(price, price, price, price, 100.0)
+        if self.features.bars_seen < self.min_bars:
             return None
 
         self._ticks_since_train += 1
@@ -67,13 +64,11 @@ class RandomForestStrategy(Strategy):
         if not self.model_ready:
             return None
 
-        features_df = self.fe.calculate_features(pd.DataFrame(list(self.bars)))
-        if features_df.empty:
+        last = self.features.window(1)
+        if last is None:
             return None
 
-        last = features_df.iloc[[-1]]
-        feature_cols = ["RSI", "MACD", "MACD_line", "MACD_signal", "log_ret", "ATR", "BBU", "BBL", "BBM"]
-        prob_up = float(self.model.predict_proba(last[feature_cols].to_numpy())[0][1])
+        prob_up = float(self.model.predict_proba(last[:, FEATURES])[0][1])
 
         if prob_up > self.confidence_threshold:
             signal = "BUY"
@@ -85,11 +80,11 @@ class RandomForestStrategy(Strategy):
             return None
 
         fi = self.model.feature_importances_
-        names = np.array(feature_cols)
+        names = np.array(FEATURE_COLUMNS)
         top_idx = np.argsort(fi)[-3:][::-1]
         explanation = [f"{names[i]} importance: {fi[i]:.2f}" for i in top_idx]
 
-        atr = float(last["ATR"].iloc[0]) if "ATR" in last.columns else price * 0.005
+        atr = float(last[0, _ATR_IDX])
         direction = 1 if signal == "BUY" else -1
 
         return {
@@ -1,11 +1,82 @@
 from typing import Dict, Any, Optional, Deque
 from collections import deque
-import statistics
+import itertools
 import logging
+import math
+import numpy as np
 from .base import Strategy
 
+try:
+    from numba import njit
+except ImportError:  # optional: batch replay also runs as plain Python
+    njit = None
+
 logger = logging.getLogger("TitanSMACrossover")
 
+# SMAs closer than this (relative to the slow SMA) count as equal, so rounding
+# noise in the running sums can't fire a crossover on flat prices.
+_CROSS_EPS = 1e-12
+
+
+def _sma_signal_kernel(prices, fast, slow, out):
+    """
+    Replay SMACrossover.on_tick over a price vector: ``out[i]`` is 1 (BUY),
+    -1 (SELL) or 0.  Same running sums, periodic re-sum, tolerance and
+    position latch as the live path; non-positive prices are skipped.
+    """
+    maxlen = slow + 1
+    fast_w = min(fast, maxlen)
+    ring = np.empty(maxlen, dtype=np.float64)  # last maxlen accepted prices
+    k = 0  # accepted prices so far
+    fast_sum = 0.0
+    slow_sum = 0.0
+    position = 0
+    for i in range(prices.shape[0]):
+        out[i] = 0
+        p = prices[i]
+        if p <= 0.0:
+            continue
+
+        n = min(k, maxlen)
+        if n >= fast_w:
+            fast_sum -= ring[(k - fast_w) % maxlen]
+        if n >= slow:
+            slow_sum -= ring[(k - slow) % maxlen]
+        ring[k % maxlen] = p
+        k += 1
+        fast_sum += p
+        slow_sum += p
+
+        n = min(k, maxlen)
+        if k % slow == 0:
+            fast_sum = 0.0
+            for j in range(k - min(n, fast_w), k):
+                fast_sum += ring[j % maxlen]
+            slow_sum = 0.0
+            for j in range(k - min(n, slow), k):
+                slow_sum += ring[j % maxlen]
+
+        if n < slow:
+            continue
+        fast_sma = fast_sum / min(n, fast_w)
+        slow_sma = slow_sum / slow
+        spread = fast_sma - slow_sma
+        tolerance = _CROSS_EPS * abs(slow_sma)
+        if spread > tolerance and position != 1:
+            out[i] = 1
+            position = 1
+        elif spread < -tolerance and position != -1:
+            out[i] = -1
+            position = -1
+
+
+# Compiled eagerly (explicit signature) so replay pays no first-call JIT.
+_compute_sma_signals = (
+    njit("void(float64[::1], int64, int64, int8[::1])", cache=True)(_sma_signal_kernel)
+    if njit is not None
+    else _sma_signal_kernel
+)
+
 class SMACrossover(Strategy):
     """
     Simple Moving Average Crossover Strategy.
@@ -23,30 +94,67 @@ class SMACrossover(Strategy):
         self.prices: Deque[float] = deque(maxlen=self.slow_period + 1)
         self.current_position = None # 'LONG', 'SHORT', or None
 
+        # Running window sums: each tick adds the new price and drops the one
+        # leaving each window, instead of re-averaging both windows.
+        self._fast_window = min(self.fast_period, self.prices.maxlen)
+        self._fast_sum = 0.0
+        self._slow_sum = 0.0
+        self._ticks = 0
+
+    def run_batch(self, prices) -> np.ndarray:
+        """
+        Crossover signals for a whole price series (backtest/replay), as an
+        int8 array of 1 (BUY), -1 (SELL) or 0 aligned with ``prices``.
+
+        Runs the on_tick arithmetic in one compiled loop from a fresh state;
+        the strategy's own live state is not touched.
+        """
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
+        out = np.empty(prices.shape[0], dtype=np.int8)
+        _compute_sma_signals(prices, self.fast_period, self.slow_period, out)
+        return out
+
     async def on_tick(self, tick: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         price = float(tick.get("price", 0.0))
         if price <= 0:
             return None
 
-        self.prices.append(price)
-        
+        prices = self.prices
+        n = len(prices)
+        if n >= self._fast_window:
+            self._fast_sum -= prices[-self._fast_window]
+        if n >= self.slow_period:
+            self._slow_sum -= prices[-self.slow_period]
+        prices.append(price)
+        self._fast_sum += price
+        self._slow_sum += price
+
+        # Re-sum exactly once per slow window so rounding error can't build up.
+        self._ticks += 1
+        if self._ticks % self.slow_period == 0:
+            n = len(prices)
+            self._fast_sum = math.fsum(itertools.islice(prices, max(n - self._fast_window, 0), None))
+            self._slow_sum = math.fsum(itertools.islice(prices, max(n - self.slow_period, 0), None))
+
         # Need enough data
-        if len(self.prices) < self.slow_period:
+        if len(prices) < self.slow_period:
             return None
 
         # Calculate SMAs
-        fast_sma = statistics.mean(list(self.prices)[-self.fast_period:])
-        slow_sma = statistics.mean(list(self.prices)[-self.slow_period:])
-        
+        fast_sma = self._fast_sum / min(len(prices), self._fast_window)
+        slow_sma = self._slow_sum / self.slow_period
+        spread = fast_sma - slow_sma
+        tolerance = _CROSS_EPS * abs(slow_sma)
+
         signal = None
         
         # Logic: Crossover
-        if fast_sma > slow_sma and self.current_position != "LONG":
+        if spread > tolerance and self.current_position != "LONG":
             signal = "BUY"
             self.current_position = "LONG"
             logger.info(f"[{self.symbol}] Golden Cross! Fast={fast_sma:.2f} > Slow={slow_sma:.2f}")
             
-        elif fast_sma < slow_sma and self.current_position != "SHORT": # Or just close long?
+        elif spread < -tolerance and self.current_position != "SHORT": # Or just close long?
             # For this simple bot, we reverse or close. Let's say we reverse to SHORT purely or just SELL to close.
             # Let's map SELL to "Exit Long" or "Enter Short"
             signal = "SELL"
@@ -1,12 +1,11 @@
 import logging
 import asyncio
 import numpy as np
-import pandas as pd
 import torch
-from typing import Dict, Any, Optional, Deque
-from collections import deque
+from typing import Dict, Any, Optional
 from .base import Strategy
-from feature_engineering import FeatureEngineer
+from feature_engineering import standardize
+from online_state import CLOSE_IDX, ROW_COLUMNS, OnlineFeatures
 from models.tft_model import TFTModel
 
 logger = logging.getLogger("TitanTFT")
@@ -24,13 +23,21 @@ class TFTStrategy(Strategy):
         
         # Warmup
         self.warmup_period = 200
-        self.prices: Deque[float] = deque(maxlen=self.warmup_period)
         
-        # Feature Engineering
-        self.fe = FeatureEngineer()
+        # Feature Engineering (incremental)
+        self.features = OnlineFeatures(capacity=self.warmup_period)
+        # Reused model-input scratch; inference finishes before the next tick.
+        # The model input tensor shares its memory, so no per-tick tensor
+        # is built.
+        self._batch = np.empty((1, self.lookback, len(ROW_COLUMNS)), dtype=np.float32)
+        self._scaled = self._batch[0]
+        self._tensor_in = torch.from_numpy(self._batch)  # [1, lookback, 14]
         
         # Model
-        self.model = TFTModel(input_size=14, d_model=64, num_layers=2, output_horizon=self.output_horizon)
+        self.model = TFTModel(
+            input_size=14, d_model=64, num_layers=2,
+            output_horizon=self.output_horizon, max_len=self.lookback,
+        )
         
         # Load Trained Weights
         import os
@@ -52,48 +59,32 @@ class TFTStrategy(Strategy):
 
     async def on_tick(self, tick: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         price = float(tick["price"])
-        self.prices.append(price)
-        
-        if len(self.prices) < self.warmup_period:
+        if price <= 0:
             return None
-
-        # Create DataFrame from buffer
-        df = pd.DataFrame({
-            "open": list(self.prices),
-            "high": list(self.prices),
-            "low": list(self.prices),
-            "close": list(self.prices),
-            "volume": [1000] * len(self.prices)
-        })
+        # O/H/L/C are all set to price (tick-based); indicators advance by one bar
+        self.features.update(price, price, price, price, 1000.0)
         
-        # Features
-        df = self.fe.calculate_features(df)
-        df.dropna(inplace=True)
-        
-        if len(df) < self.lookback:
+        if self.features.bars_seen < self.warmup_period:
             return None
 
-        # Prepare Input
-        cols = ['open', 'high', 'low', 'close', 'volume', 'RSI', 'MACD', 'MACD_line', 'MACD_signal', 'log_ret', 'ATR', 'BBU', 'BBL', 'BBM']
-        # Select available columns (expecting all 14)
-        available_cols = [c for c in cols if c in df.columns]
-        recent_data = df[available_cols].iloc[-self.lookback:].values # [60, 14]
+        # Prepare Input: [60, 14] in online_state.ROW_COLUMNS order
+        recent_data = self.features.window(self.lookback)
+        if recent_data is None:
+            return None
         
         # Scale (using simple standardization, same as training script)
-        mean = np.mean(recent_data, axis=0)
-        std = np.std(recent_data, axis=0) + 1e-8
-        scaled_data = (recent_data - mean) / std
+        scaled_data, mean, std = standardize(recent_data, out=self._scaled)
         
-        tensor_in = torch.FloatTensor(scaled_data).unsqueeze(0).to(self.device) # [1, 60, 14]
+        tensor_in = self._tensor_in  # view of self._batch (cpu)
         
         # Inference
-        with torch.no_grad():
+        with torch.inference_mode():
             # Output is [1, 5] (predictions for next 5 steps in scaled space)
             predictions = self.model(tensor_in).squeeze(0).cpu().numpy() # [60]
             
         # Interpret
         # The model was trained to predict the scaled 'close' price.
-        close_idx = available_cols.index('close')
+        close_idx = CLOSE_IDX
         current_scaled_close = scaled_data[-1, close_idx]
         
         # Use the final prediction (t+60) as the 1-hour forecast
@@ -9,7 +9,7 @@ import torch
 sys.path.append(os.getcwd())
 
 from feature_engineering import FeatureEngineer
-from model import load_model, HybridModel
+from model import load_model, predict_proba, HybridModel
 from explainability import XAIEngine
 
 def test_signal_pipeline():
@@ -54,8 +54,7 @@ def test_signal_pipeline():
     model = load_model(input_dim=8)
     
     with torch.no_grad():
-        logits = model(input_tensor)
-        probs = logits.numpy()
+        probs = predict_proba(model, input_tensor).numpy()
         
     print(f"✅ Model Output Probs: {probs}")
     if probs.shape != (1, 3):
@@ -65,7 +64,7 @@ def test_signal_pipeline():
     # 4. Explainability (XAI)
     print("[4] Testing XAI Engine...")
     # Create background data (random for test)
-    background = np.zeros((5, 60, 8))
+    background = np.zeros((5, 60, 8), dtype=np.float32)
     xai = XAIEngine(model, background)
     
     try:
@@ -0,0 +1,186 @@
+"""
+TitanFlow Shared Batched Redis Publisher
+
+Coalesces Redis PUBLISH calls into pipelined batches so a burst of messages
+costs one network round trip instead of one per message.
+
+Producers enqueue pre-serialized payloads without awaiting; a background
+task drains the queue and flushes up to ``max_batch`` messages per pipeline,
+lingering ``linger`` seconds after the first message so a burst can
+accumulate.
+
+Usage:
+    from publisher import BatchedPublisher
+    from serialization import dumps
+
+    publisher = BatchedPublisher(redis_client)
+    publisher.start()
+    publisher.publish_nowait("market_data", dumps(tick))
+    ...
+    await publisher.flush()   # waits until everything queued so far is sent
+    await publisher.close()   # flushes anything still queued
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Payload = Union[bytes, str]
+
+# Queued by close() to tell the drain task to flush and exit.
+_STOP = object()
+
+
+class BatchedPublisher:
+    """Queue-backed Redis publisher that flushes messages through a pipeline."""
+
+    def __init__(
+        self,
+        redis_client,
+        max_batch: Optional[int] = None,
+        linger: Optional[float] = None,
+        max_queue: Optional[int] = None,
+    ):
+        self.redis = redis_client
+        self.max_batch = max_batch or int(os.getenv("REDIS_PUBLISH_BATCH", "64"))
+        self.linger = (
+            linger if linger is not None
+            else float(os.getenv("REDIS_PUBLISH_LINGER_MS", "1")) / 1000.0
+        )
+        self._queue: asyncio.Queue = asyncio.Queue(
+            maxsize=max_queue or int(os.getenv("REDIS_PUBLISH_QUEUE_MAX", "10000"))
+        )
+        self._task: Optional[asyncio.Task] = None
+        # Cuts the linger short once a full batch is queued or on close().
+        self._wake = asyncio.Event()
+        self._closing = False
+        # Callers currently waiting in flush(); lingering is skipped for them.
+        self._flushing = 0
+        self.dropped: int = 0
+        # Messages lost because their pipeline flush raised.
+        self.failed: int = 0
+
+    def start(self) -> None:
+        """Start the background drain task (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def publish_nowait(self, channel: str, payload: Payload) -> bool:
+        """
+        Enqueue a message for the next pipeline flush.
+
+        Returns False (and drops the message) when the queue is full, so a
+        stalled Redis connection cannot grow memory without bound.
+        """
+        try:
+            self._queue.put_nowait((channel, payload))
+            # The drain task already holds the batch's first message.
+            if self._queue.qsize() >= self.max_batch - 1:
+                self._wake.set()
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.error(
+                    "Publish queue full — dropped %d message(s) so far (latest on %s).",
+                    self.dropped, channel,
+                )
+            return False
+
+    async def flush(self) -> None:
+        """
+        Wait until every message queued so far has been handed to Redis.
+
+        Callers that publish on a separate, immediate path use this to keep
+        that message from overtaking ones still waiting in the queue.
+        """
+        if self._task is None or self._task.done():
+            return
+        self._flushing += 1
+        self._wake.set()
+        try:
+            await self._queue.join()
+        finally:
+            self._flushing -= 1
+
+    async def close(self) -> None:
+        """Flush everything queued so far, then stop the drain task."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            # The sentinel is queued behind pending messages, so they flush first.
+            self._closing = True
+            await self._queue.put(_STOP)
+            self._wake.set()
+            await self._task
+        self._task = None
+        self._closing = False
+
+    async def _collect_batch(self) -> Tuple[List[Tuple[str, Payload]], bool]:
+        """
+        Wait for one message, linger once for more, then drain up to max_batch.
+
+        Lingering is a single timed wait per batch rather than a timed get()
+        per message.  It ends early when a full batch is queued, or on flush()
+        and close().
+
+        Returns (batch, stop) where stop is True once the close sentinel is seen.
+        """
+        queue = self._queue
+        batch: List[Tuple[str, Payload]] = []
+        item = await queue.get()
+        if item is _STOP:
+            queue.task_done()
+            return batch, True
+        batch.append(item)
+
+        if (
+            self.linger > 0
+            and not self._closing
+            and not self._flushing
+            and queue.qsize() < self.max_batch - 1
+        ):
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.linger)
+            except asyncio.TimeoutError:
+                pass
+
+        while len(batch) < self.max_batch:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if item is _STOP:
+                queue.task_done()
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _flush(self, batch: List[Tuple[str, Payload]]) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        for channel, payload in batch:
+            pipe.publish(channel, payload)
+        try:
+            await pipe.execute()
+        except Exception as exc:
+            self.failed += len(batch)
+            per_channel: dict = {}
+            for channel, _ in batch:
+                per_channel[channel] = per_channel.get(channel, 0) + 1
+            logger.error(
+                "Failed to flush %d Redis publish(es) %s: %s", len(batch), per_channel, exc
+            )
+
+    async def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch, stop = await self._collect_batch()
+            if batch:
+                await self._flush(batch)
+                for _ in batch:
+                    self._queue.task_done()
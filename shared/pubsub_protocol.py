@@ -0,0 +1,137 @@
+"""
+TitanFlow Shared Raw Redis Subscriber
+
+A minimal Redis SUBSCRIBE client built directly on asyncio.Protocol and the
+hiredis C reply parser.  Bytes from the socket are fed to hiredis in
+data_received() and every parsed message is handed to an asyncio.Queue as a
+(channel, data) tuple, with no per-message coroutine, async-generator step
+or Future in between as with redis-py's pubsub.listen().
+
+Backpressure: when the queue is full the transport stops reading (the kernel
+buffer and then TCP flow control hold further data) and resumes once the
+backlog has been handed over, so no message is dropped.
+
+Only plain, unauthenticated connections are supported; services that need
+AUTH/TLS should keep using redis-py.  ``hiredis`` is optional: check
+``AVAILABLE`` before use.
+
+Usage:
+    from pubsub_protocol import AVAILABLE, open_subscriber
+
+    queue = asyncio.Queue(maxsize=4096)
+    subscriber = await open_subscriber("redis", 6379, ["trade_signals"], queue)
+    channel, data = await queue.get()
+    ...
+    await subscriber.wait_closed()
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import socket
+from collections import deque
+from typing import Deque, Iterable, Optional, Tuple
+
+try:
+    import hiredis
+except ImportError:  # optional: callers fall back to redis-py pubsub
+    hiredis = None
+
+logger = logging.getLogger(__name__)
+
+AVAILABLE = hiredis is not None
+
+Message = Tuple[bytes, bytes]
+
+
+def encode_command(*args: str) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg.encode() if isinstance(arg, str) else arg
+        out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(out)
+
+
+class RedisSubscriberProtocol(asyncio.Protocol):
+    """Parses pushed pubsub replies with hiredis and queues (channel, data)."""
+
+    def __init__(self, queue: asyncio.Queue):
+        self._parser = hiredis.Reader()
+        self._queue = queue
+        self._backlog: Deque[Message] = deque()
+        self._drainer: Optional[asyncio.Task] = None
+        self.transport: Optional[asyncio.Transport] = None
+        self._closed = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        parser = self._parser
+        parser.feed(data)
+        while True:
+            reply = parser.gets()
+            if reply is False:
+                return
+            if isinstance(reply, hiredis.ReplyError):
+                logger.error("Redis subscriber error reply: %s", reply)
+            elif reply[0] == b"message":
+                self._deliver((reply[1], reply[2]))
+            # subscribe/unsubscribe confirmations are ignored.
+
+    def _deliver(self, message: Message) -> None:
+        if self._backlog:
+            # Keep ordering behind messages already waiting for queue space.
+            self._backlog.append(message)
+            return
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self._backlog.append(message)
+            self.transport.pause_reading()
+            self._drainer = asyncio.ensure_future(self._drain_backlog())
+
+    async def _drain_backlog(self) -> None:
+        while self._backlog:
+            await self._queue.put(self._backlog[0])
+            self._backlog.popleft()
+        if not self.transport.is_closing():
+            self.transport.resume_reading()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if exc is not None:
+            logger.error("Redis subscriber connection lost: %s", exc)
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+    async def wait_closed(self) -> None:
+        """Wait until the connection is gone and every message is queued."""
+        await self._closed
+        if self._drainer is not None:
+            await self._drainer
+
+
+async def open_subscriber(
+    host: str,
+    port: int,
+    channels: Iterable[str],
+    queue: asyncio.Queue,
+    recv_buffer: Optional[int] = None,
+) -> RedisSubscriberProtocol:
+    """Connect, SUBSCRIBE to ``channels`` and return the running protocol."""
+    if hiredis is None:
+        raise RuntimeError("hiredis is required for the raw Redis subscriber")
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_connection(
+        lambda: RedisSubscriberProtocol(queue), host, port
+    )
+    sock = transport.get_extra_info("socket")
+    if sock is not None and recv_buffer:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, recv_buffer)
+    transport.write(encode_command("SUBSCRIBE", *channels))
+    return protocol
@@ -0,0 +1,53 @@
+"""
+TitanFlow Shared JSON Serialization
+
+Fast JSON encode/decode for Redis pub/sub and websocket hot paths.
+
+Uses orjson (C implementation) when it is installed and falls back to the
+stdlib json module otherwise, so services stay runnable without it.
+
+Both backends return the same types:
+    dumps(obj) -> bytes   (Redis publish and websockets accept bytes directly)
+    loads(data) -> object (accepts bytes, bytearray, memoryview or str)
+
+Usage:
+    from serialization import dumps, loads
+
+    await redis.publish("market_data", dumps(payload))
+    data = loads(message["data"])
+"""
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only when orjson is absent
+    orjson = None
+
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError
+
+    # Model outputs often carry NumPy scalars/arrays; serialize them natively.
+    _DUMPS_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize *obj* to compact JSON bytes."""
+        return orjson.dumps(obj, option=_DUMPS_OPTIONS)
+
+    loads = orjson.loads
+else:  # pragma: no cover - exercised only when orjson is absent
+    JSONDecodeError = json.JSONDecodeError
+
+    def _default(obj: Any) -> Any:
+        # NumPy scalars and arrays both expose tolist().
+        if hasattr(obj, "tolist"):
+            return obj.tolist()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize *obj* to compact JSON bytes."""
+        return json.dumps(obj, separators=(",", ":"), default=_default).encode("utf-8")
+
+    loads = json.loads
@@ -0,0 +1,78 @@
+"""
+Unit tests for services/gateway/providers/alpaca_provider.py
+
+The Alpaca stream is the live market-data feed.  Reconnects must back off
+exponentially (capped, with jitter) while the feed is down and reset once a
+subscription succeeds, so an outage neither stalls recovery nor hammers the
+broker.  No network access: the websocket is replaced with fakes.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from providers import alpaca_provider
+from providers.alpaca_provider import AlpacaDataProvider
+
+
+class _StopTest(Exception):
+    pass
+
+
+def make_provider():
+    return AlpacaDataProvider({"ALPACA_API_KEY": "k", "ALPACA_SECRET_KEY": "s"})
+
+
+def run_until_sleeps(provider, n_sleeps):
+    """Run subscribe() and return the reconnect delays it slept for."""
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+        if len(waits) >= n_sleeps:
+            raise _StopTest
+
+    async def noop(_):
+        pass
+
+    with patch.object(alpaca_provider.asyncio, "sleep", fake_sleep), \
+         patch.object(alpaca_provider.random, "uniform", return_value=0.0):
+        with pytest.raises(_StopTest):
+            asyncio.run(provider.subscribe(["SPY"], noop))
+    return waits
+
+
+class TestReconnectBackoff:
+    def test_delay_doubles_up_to_cap(self):
+        provider = make_provider()
+        provider._connect_and_auth = AsyncMock(side_effect=OSError("down"))
+        waits = run_until_sleeps(provider, 8)
+        assert waits == [1.0, 2.0, 4.0, 8.0, 16.0, 30.0, 30.0, 30.0]
+
+    def test_delay_resets_after_successful_subscribe(self):
+        provider = make_provider()
+
+        class _ClosingSocket:
+            async def send(self, _):
+                pass
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                raise OSError("dropped")
+
+        attempts = iter([OSError("down"), OSError("down"), None, OSError("down")])
+
+        async def connect():
+            exc = next(attempts)
+            if exc:
+                raise exc
+            provider.ws = _ClosingSocket()
+
+        provider._connect_and_auth = connect
+        waits = run_until_sleeps(provider, 4)
+        # Two failures, a successful subscribe that later drops, then a failure.
+        assert waits == [1.0, 2.0, 1.0, 2.0]
+
+    def test_history_client_is_not_built_eagerly(self):
+        assert make_provider()._history_client is None
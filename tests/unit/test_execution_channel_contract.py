@@ -15,10 +15,11 @@ re-introduced, giving CI a deterministic signal contract regression check.
 """
 import importlib.util
 import inspect
+import json
 import pathlib
 import re
 import sys
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 from core.manager import PortfolioManager
 
@@ -155,6 +156,18 @@ class TestSimulateFillAcceptsExecutionRequests:
         missing = required - fill.keys()
         assert not missing, f"Fill event missing required fields: {missing}"
 
+    async def test_accepts_prevalidated_event(self):
+        """The paper loop hands over the validated event instead of the raw dict."""
+        manager = PortfolioManager()
+        event = execution_main.ExecutionRequestEvent.from_dict(
+            _execution_request(side="buy", qty=4)
+        )
+        fill = await simulate_fill(event, current_price=100.0, manager=manager)
+        assert fill is not None
+        assert fill["side"] == "BUY"
+        assert fill["qty"] == 4
+        assert fill["explanation"] == ["rsi: 0.42", "macd: 0.18"]
+
 
 class TestSimulateFillRejectsTradeSignals:
     """simulate_fill must return None for raw trade_signals payloads.
@@ -206,10 +219,20 @@ class TestChannelSubscriptionContract:
     """
 
     def _subscribe_args(self, fn_name: str) -> list:
-        """Return argument strings from every pubsub.subscribe(...) call in fn."""
+        """Return argument strings from every subscribe(...) call in fn.
+
+        Each loop consumes its channels through _consume_channel(), which
+        opens a dedicated pubsub per channel, so those calls count as
+        subscriptions too.
+        """
         # Extract only the relevant function's source from the full module source
         src = inspect.getsource(getattr(execution_main, fn_name))
-        return re.findall(r'subscribe\(([^)]+)\)', src)
+        return re.findall(r'subscribe\(([^)]+)\)', src) + self._consumed_channels(src)
+
+    @staticmethod
+    def _consumed_channels(src: str) -> list:
+        """Return channel names passed to _consume_channel(...) in src."""
+        return re.findall(r'_consume_channel\(\s*\w+,\s*["\']([^"\']+)["\']', src)
 
     def test_paper_loop_subscribes_to_execution_requests(self):
         src = inspect.getsource(execution_main.run_paper_execution)
@@ -226,13 +249,13 @@ class TestChannelSubscriptionContract:
 
     def test_paper_loop_channel_handler_checks_execution_requests(self):
         src = inspect.getsource(execution_main.run_paper_execution)
-        branch_channels = re.findall(r'channel\s*==\s*["\']([^"\']+)["\']', src)
-        assert "execution_requests" in branch_channels, (
-            "run_paper_execution must have an elif branch for 'execution_requests'"
+        consumed = self._consumed_channels(src)
+        assert "execution_requests" in consumed, (
+            "run_paper_execution must consume 'execution_requests'"
         )
-        assert "trade_signals" not in branch_channels, (
-            f"run_paper_execution must not branch on 'trade_signals'. "
-            f"Found: {branch_channels}"
+        assert "trade_signals" not in consumed, (
+            f"run_paper_execution must not consume 'trade_signals'. "
+            f"Found: {consumed}"
         )
 
     def test_live_loop_subscribes_to_execution_requests(self):
@@ -247,3 +270,33 @@ class TestChannelSubscriptionContract:
                 f"run_live_execution must NOT subscribe to 'trade_signals'. "
                 f"Found in subscribe(): {call}"
             )
+
+
+# ---------------------------------------------------------------------------
+# Part 3: Leaderboard publish contract
+# ---------------------------------------------------------------------------
+
+class TestPublishPortfolios:
+    """publish_portfolios broadcasts only the top-K portfolios by equity."""
+
+    async def test_broadcasts_top_k_by_equity(self):
+        manager = PortfolioManager()
+        for i, cash in enumerate([100.0, 300.0, 200.0]):
+            manager.create_portfolio(f"m{i}", starting_cash=cash)
+
+        redis_client = MagicMock()
+        redis_client.publish = AsyncMock()
+        redis_client.set = AsyncMock()
+
+        await execution_main.publish_portfolios(redis_client, manager, {}, top_k=2)
+
+        channel, raw = redis_client.publish.await_args.args
+        payload = json.loads(raw)
+        assert channel == "paper_portfolio_updates"
+        assert payload["best_model"] == "m1"
+        assert [m["model_id"] for m in payload["models"]] == ["m1", "m2"]
+
+        # The full list remains available for on-demand readers
+        _, snapshot = redis_client.set.await_args.args
+        assert len(json.loads(snapshot)["models"]) == 3
+
@@ -9,7 +9,7 @@ indicator's invariants are verified here.
 import pytest
 import pandas as pd
 import numpy as np
-from feature_engineering import FeatureEngineer
+from feature_engineering import FeatureEngineer, rsi, standardize
 
 
 # ---------------------------------------------------------------------------
@@ -142,3 +142,93 @@ class TestNoMutation:
         fe.calculate_features(df)
         assert list(df.columns) == original_cols
         pd.testing.assert_series_equal(df["close"], original_close)
+
+    def test_string_columns_converted_without_touching_input(self):
+        df = make_ohlcv(100).astype(str)
+        out = make_engineer().calculate_features(df)
+        assert df["close"].dtype == object
+        assert pd.api.types.is_float_dtype(out["close"])
+
+    def test_rows_with_input_gaps_dropped(self):
+        df = make_ohlcv(100)
+        df["note"] = "x"
+        df.loc[80, "note"] = None
+        out = make_engineer().calculate_features(df)
+        assert 80 not in out.index
+        assert 81 in out.index
+
+
+# ---------------------------------------------------------------------------
+# Parity with the 'ta' library definitions the models were trained on
+# ---------------------------------------------------------------------------
+
+class TestParityWithTa:
+    @pytest.mark.parametrize("n", [40, 100, 500])
+    def test_indicators_match_ta(self, n):
+        ta = pytest.importorskip("ta")
+        df = make_ohlcv(n)
+        result = make_engineer().calculate_features(df)
+
+        close, high, low = df["close"], df["high"], df["low"]
+        bb = ta.volatility.BollingerBands(close=close, window=20, window_dev=2)
+        expected = pd.DataFrame({
+            "RSI": ta.momentum.rsi(close, window=14),
+            "MACD": ta.trend.macd_diff(close, window_slow=26, window_fast=12, window_sign=9),
+            "MACD_line": ta.trend.macd(close, window_slow=26, window_fast=12),
+            "MACD_signal": ta.trend.macd_signal(close, window_slow=26, window_fast=12, window_sign=9),
+            "log_ret": close.pct_change(),
+            "ATR": ta.volatility.average_true_range(high, low, close, window=14),
+            "BBU": bb.bollinger_hband(),
+            "BBL": bb.bollinger_lband(),
+            "BBM": bb.bollinger_mavg(),
+        }).dropna()
+
+        assert list(result.index) == list(expected.index)
+        for col in EXPECTED_COLUMNS:
+            np.testing.assert_allclose(result[col], expected[col], rtol=1e-9, atol=1e-9)
+
+    @pytest.mark.parametrize("window", [7, 14, 21])
+    def test_standalone_rsi_matches_ta(self, window):
+        ta = pytest.importorskip("ta")
+        close = make_ohlcv(200)["close"]
+        np.testing.assert_allclose(
+            rsi(close.to_numpy(), window),
+            ta.momentum.rsi(close, window=window).to_numpy(),
+            rtol=1e-9, atol=1e-9, equal_nan=True,
+        )
+
+    def test_short_history_yields_no_rows(self):
+        assert make_engineer().calculate_features(make_ohlcv(20)).empty
+
+
+# ---------------------------------------------------------------------------
+# normalize
+# ---------------------------------------------------------------------------
+
+class TestNormalize:
+    def test_matches_float64_standard_scaling(self):
+        df = make_engineer().calculate_features(make_ohlcv(150))
+        cols = ["close", "volume", "RSI", "ATR"]
+        scaled, mean, std = FeatureEngineer.normalize(df, cols, 60)
+
+        window = df[cols].to_numpy()[-60:]
+        expected = (window - window.mean(axis=0)) / (window.std(axis=0) + 1e-8)
+        assert scaled.dtype == np.float32
+        assert scaled.shape == (60, 4)
+        assert scaled.flags["C_CONTIGUOUS"]
+        np.testing.assert_allclose(scaled, expected, atol=1e-4)
+        np.testing.assert_allclose(scaled * std + mean, window, rtol=1e-5)
+
+    def test_flat_column_scales_to_zero(self):
+        df = pd.DataFrame({"a": [5.0] * 10, "b": np.arange(10.0)})
+        scaled, _, _ = FeatureEngineer.normalize(df, ["a", "b"], 10)
+        assert np.all(scaled[:, 0] == 0.0)
+        assert np.isfinite(scaled).all()
+
+    def test_standardize_writes_into_scratch_buffer(self):
+        window = make_ohlcv(60)[["close", "volume"]].to_numpy()
+        scratch = np.empty((60, 2), dtype=np.float32)
+        scaled, mean, std = standardize(window, out=scratch)
+        assert scaled is scratch
+        np.testing.assert_allclose(mean, window.mean(axis=0), rtol=1e-12)
+        np.testing.assert_allclose(std, window.std(axis=0) + 1e-8, rtol=1e-9)
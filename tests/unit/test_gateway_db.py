@@ -0,0 +1,133 @@
+"""
+Unit tests for services/gateway/db.py
+
+DatabaseManager.write_tick is the QuestDB ingest path for every tick.  Lines
+are batched into UDP datagrams, so each datagram must stay under the MTU cap
+and no buffered line may be lost on flush.
+"""
+import asyncio
+import importlib.util
+import json
+import pathlib
+from unittest.mock import MagicMock
+
+import pytest
+from tick_codec import unpack_tick
+
+# services/signal also ships a db.py, so load the gateway module by path.
+_DB_PATH = pathlib.Path(__file__).parent.parent.parent / "services" / "gateway" / "db.py"
+_spec = importlib.util.spec_from_file_location("gateway_db", _DB_PATH)
+gateway_db = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(gateway_db)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def manager():
+    m = gateway_db.DatabaseManager()
+    m.sock.close()
+    m.sock = MagicMock()
+    # The buffer is reused after sending, so snapshot it at call time.
+    m.sent = []
+    m.sock.sendto.side_effect = lambda data, addr: m.sent.append(bytes(data))
+    return m
+
+
+def sent_datagrams(manager) -> list:
+    return manager.sent
+
+
+# ---------------------------------------------------------------------------
+# write_tick / flush_ticks
+# ---------------------------------------------------------------------------
+
+class TestIlpBatching:
+    def test_write_tick_buffers_without_sending(self, manager):
+        manager.write_tick("SPY", 450.25, 10, 1_700_000_000_000_000_000)
+        manager.sock.sendto.assert_not_called()
+
+    def test_flush_sends_all_lines_in_one_datagram(self, manager):
+        manager.write_tick("SPY", 450.25, 10, 1)
+        manager.write_tick("AAPL", 175.5, 3, 2)
+        manager.flush_ticks()
+
+        assert sent_datagrams(manager) == [
+            b"market_data,symbol=SPY price=450.25,size=10i 1\n"
+            b"market_data,symbol=AAPL price=175.5,size=3i 2\n"
+        ]
+
+    def test_flush_with_empty_buffer_is_noop(self, manager):
+        manager.flush_ticks()
+        manager.sock.sendto.assert_not_called()
+
+    def test_datagrams_never_exceed_max_size(self, manager):
+        manager.ilp_max_datagram = 200
+        for i in range(50):
+            manager.write_tick("MSFT", 350.0 + i, i + 1, i)
+        manager.flush_ticks()
+
+        datagrams = sent_datagrams(manager)
+        assert len(datagrams) > 1
+        assert all(len(d) <= 200 for d in datagrams)
+        lines = b"".join(datagrams).splitlines()
+        assert len(lines) == 50
+
+    @pytest.mark.parametrize("price", [450.25, 0.1 + 0.2, 1e-7, 123456789.0, 100])
+    def test_encoded_line_matches_reference_format(self, manager, price):
+        manager.write_tick("NVDA", price, 7, 1_700_000_000_000_000_000)
+        manager.flush_ticks()
+
+        expected = f"market_data,symbol=NVDA price={float(price)},size=7i 1700000000000000000\n"
+        assert sent_datagrams(manager) == [expected.encode()]
+
+
+class TestNonBlockingSend:
+    async def test_would_block_queues_datagram_until_writable(self, manager, monkeypatch):
+        loop = asyncio.get_running_loop()
+        writers = {}
+        monkeypatch.setattr(loop, "add_writer", lambda sock, cb: writers.__setitem__(sock, cb))
+        monkeypatch.setattr(loop, "remove_writer", lambda sock: writers.pop(sock, None))
+
+        manager.sock.sendto.side_effect = BlockingIOError
+        manager.write_tick("SPY", 1.0, 1, 1)
+        manager.flush_ticks()
+        manager.write_tick("SPY", 2.0, 1, 2)
+        manager.flush_ticks()
+        assert len(manager._ilp_pending) == 2
+        assert manager.sock in writers
+
+        # Socket becomes writable: both datagrams go out in order
+        manager.sock.sendto.side_effect = lambda data, addr: manager.sent.append(bytes(data))
+        writers[manager.sock]()
+
+        assert sent_datagrams(manager) == [
+            b"market_data,symbol=SPY price=1.0,size=1i 1\n",
+            b"market_data,symbol=SPY price=2.0,size=1i 2\n",
+        ]
+        assert not manager._ilp_pending
+        assert manager.sock not in writers
+
+
+class TestPublishTick:
+    def test_enqueues_binary_and_json_ticks_without_awaiting(self, manager):
+        manager.publisher = MagicMock()
+        manager.publish_tick("SPY", 450.25, 10, 123)
+
+        published = dict(c.args for c in manager.publisher.publish_nowait.call_args_list)
+        expected = {"symbol": "SPY", "price": 450.25, "size": 10, "timestamp": 123, "type": "trade"}
+        assert unpack_tick(published["market_data_bin"]) == expected
+        assert json.loads(published["market_data"]) == expected
+
+    def test_json_tick_survives_binary_pack_failure(self, manager):
+        manager.publisher = MagicMock()
+        manager.publish_tick("X" * 300, 450.25, 10, 123)  # symbol too long to pack
+
+        published = dict(c.args for c in manager.publisher.publish_nowait.call_args_list)
+        assert "market_data_bin" not in published
+        assert json.loads(published["market_data"])["symbol"] == "X" * 300
+
+    def test_noop_before_connect(self, manager):
+        manager.publish_tick("SPY", 450.25, 10, 123)  # must not raise
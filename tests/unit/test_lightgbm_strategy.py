@@ -0,0 +1,64 @@
+"""
+Unit tests for services/signal/strategies/lightgbm_strategy.py
+
+The strategy scores only the newest OnlineFeatures row and explains signals
+with LightGBM's native TreeSHAP (Booster.predict(pred_contrib=True)), so
+the explanation must name the largest contributions for the scored row.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+lgb = pytest.importorskip("lightgbm")
+
+from online_state import ROW_COLUMNS
+from strategies.lightgbm_strategy import LightGBMStrategy
+
+
+def make_strategy(booster=None) -> LightGBMStrategy:
+    strategy = LightGBMStrategy({"symbol": "SPY", "model_id": "lgb-test"})
+    if booster is not None:
+        strategy.model = booster
+        strategy._disabled = False
+    return strategy
+
+
+def train_booster() -> "lgb.Booster":
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(400, len(ROW_COLUMNS))), columns=ROW_COLUMNS)
+    y = (X["RSI"] + 0.5 * X["MACD"] > 0).astype(int)
+    return lgb.train(
+        {"objective": "binary", "verbose": -1, "num_leaves": 7},
+        lgb.Dataset(X, y),
+        num_boost_round=20,
+    )
+
+
+async def test_disabled_without_weights_returns_none():
+    strategy = make_strategy()
+    strategy.model = None
+    strategy._disabled = True
+    assert await strategy.on_tick({"price": 100.0, "timestamp": 0}) is None
+
+
+async def test_warmup_returns_none():
+    strategy = make_strategy(train_booster())
+    for i in range(strategy.min_bars - 1):
+        assert await strategy.on_tick({"price": 100.0 + i, "timestamp": i}) is None
+
+
+def test_explanation_lists_top_contributions_in_order():
+    booster = train_booster()
+    strategy = make_strategy(booster)
+    row = pd.DataFrame(np.random.default_rng(1).normal(size=(1, len(ROW_COLUMNS))), columns=ROW_COLUMNS)
+
+    contribs = booster.predict(row, pred_contrib=True)[0]
+    # TreeSHAP contributions plus the expected value add up to the raw score.
+    assert contribs.sum() == pytest.approx(booster.predict(row, raw_score=True)[0])
+
+    # Largest |contribution| first; compare magnitudes since unused
+    # features tie at zero.
+    vals = dict(zip(ROW_COLUMNS, contribs[:-1]))
+    explanation = strategy._explain(row)
+    listed = [abs(vals[item.split(":")[0]]) for item in explanation]
+    assert listed == sorted(np.abs(contribs[:-1]), reverse=True)[:3]
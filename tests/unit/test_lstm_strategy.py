@@ -0,0 +1,46 @@
+"""
+Unit tests for services/signal/strategies/lstm_strategy.py
+
+By default the strategy quantizes the LSTM to int8 and then traces it to
+TorchScript.  The optimized model must stay close to the float model and
+still emit a probability.  A torch build that cannot quantize must fall back
+to the float model rather than fail to load.
+"""
+import pytest
+
+torch = pytest.importorskip("torch")
+
+import strategies.lstm_strategy as lstm_strategy
+from strategies.lstm_strategy import LSTMStrategy
+
+
+def make_strategy(**config) -> LSTMStrategy:
+    # Same seed -> same randomly initialised weights for every instance.
+    torch.manual_seed(0)
+    return LSTMStrategy({"symbol": "SPY", "model_id": "lstm-test", **config})
+
+
+def test_quantized_traced_output_matches_float():
+    float_model = make_strategy(quantize=False).model
+    int8_model = make_strategy().model
+    x = torch.randn(8, 60, 14, generator=torch.Generator().manual_seed(1))
+
+    with torch.inference_mode():
+        expected = float_model(x)
+        actual = int8_model(x)
+
+    assert actual.shape == expected.shape
+    assert torch.all((actual >= 0.0) & (actual <= 1.0))
+    assert torch.allclose(actual, expected, atol=0.05)
+
+
+def test_quantization_failure_keeps_float_model(monkeypatch):
+    def no_qengine(model):
+        raise RuntimeError("Didn't find engine for operation quantized::linear_prepack NoQEngine")
+
+    monkeypatch.setattr(lstm_strategy, "quantize_dynamic_int8", no_qengine)
+    strategy = make_strategy()
+
+    with torch.inference_mode():
+        prob = strategy.model(torch.zeros(1, 60, 14)).item()
+    assert 0.0 <= prob <= 1.0
@@ -0,0 +1,80 @@
+"""
+Unit tests for services/signal/online_state.py
+
+The LSTM and TFT strategies feed OnlineFeatures one bar per tick instead of
+re-running FeatureEngineer.calculate_features over their whole buffer, so a
+streamed history must produce exactly the rows the batch path would.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import online_state
+from feature_engineering import FeatureEngineer
+from online_state import ROW_COLUMNS, OnlineFeatures
+
+
+def make_ohlcv(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 0.5, n))
+    return pd.DataFrame({
+        "open":   close * 0.999,
+        "high":   close * 1.002,
+        "low":    close * 0.998,
+        "close":  close,
+        "volume": rng.integers(1000, 50000, n).astype(float),
+    })
+
+
+def stream(df: pd.DataFrame, capacity: int) -> OnlineFeatures:
+    state = OnlineFeatures(capacity)
+    for bar in df.itertuples(index=False):
+        state.update(bar.open, bar.high, bar.low, bar.close, bar.volume)
+    return state
+
+
+class TestBatchParity:
+    @pytest.mark.parametrize("n", [60, 250, 500])
+    def test_rows_match_calculate_features(self, n):
+        df = make_ohlcv(n)
+        expected = FeatureEngineer().calculate_features(df)[ROW_COLUMNS].to_numpy()
+        state = stream(df, capacity=200)
+
+        rows = min(len(expected), 200)
+        assert len(state) == rows
+        np.testing.assert_allclose(state.window(rows), expected[-rows:], rtol=1e-12, atol=1e-12)
+
+    def test_first_complete_row_matches_dropna(self):
+        df = make_ohlcv(100)
+        expected = FeatureEngineer().calculate_features(df)
+        # One bar short of the first row calculate_features keeps.
+        assert len(stream(df.iloc[:expected.index[0]], capacity=10)) == 0
+        assert len(stream(df.iloc[:expected.index[0] + 1], capacity=10)) == 1
+
+
+    def test_python_fallback_matches_compiled_update(self, monkeypatch):
+        df = make_ohlcv(300)
+        compiled = stream(df, capacity=50)
+        monkeypatch.setattr(online_state, "_compute_update", online_state._update_kernel)
+        fallback = stream(df, capacity=50)
+        assert fallback.bars_seen == compiled.bars_seen == 300
+        np.testing.assert_array_equal(fallback.window(50), compiled.window(50))
+
+
+class TestWindow:
+    def test_none_until_enough_rows(self):
+        state = stream(make_ohlcv(40), capacity=50)
+        assert state.window(len(state) + 1) is None
+        assert state.window(len(state)).shape == (len(state), len(ROW_COLUMNS))
+
+    def test_window_is_contiguous_across_wraparound(self):
+        state = stream(make_ohlcv(137), capacity=16)
+        window = state.window(16)
+        assert window.flags["C_CONTIGUOUS"]
+        # Oldest first: the close column is the last 16 closes in order.
+        np.testing.assert_array_equal(window[:, 3], make_ohlcv(137)["close"].to_numpy()[-16:])
+
+    def test_window_is_read_only(self):
+        window = stream(make_ohlcv(60), capacity=20).window(5)
+        with pytest.raises(ValueError):
+            window[0, 0] = 1.0
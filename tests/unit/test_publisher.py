@@ -0,0 +1,129 @@
+"""
+Unit tests for shared/publisher.py
+
+BatchedPublisher sits between the tick/approval producers and Redis.  A lost
+or reordered message means a consumer acts on stale state, so batching,
+ordering, flush-on-close and the bounded-queue drop policy are verified here.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from publisher import BatchedPublisher
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+class FakeRedis:
+    """Records every pipeline flush as a list of (channel, payload) tuples."""
+
+    def __init__(self):
+        self.flushes = []
+
+    def pipeline(self, transaction=True):
+        batch = []
+        pipe = MagicMock()
+        pipe.publish = lambda channel, payload: batch.append((channel, payload))
+
+        async def execute():
+            self.flushes.append(list(batch))
+
+        pipe.execute = AsyncMock(side_effect=execute)
+        return pipe
+
+
+# ---------------------------------------------------------------------------
+# Batching
+# ---------------------------------------------------------------------------
+
+class TestBatching:
+    async def test_burst_is_flushed_in_one_pipeline(self):
+        redis = FakeRedis()
+        pub = BatchedPublisher(redis, max_batch=64, linger=0.01)
+        pub.start()
+        for i in range(10):
+            pub.publish_nowait("market_data", b"%d" % i)
+        await pub.close()
+
+        assert len(redis.flushes) == 1
+        assert [p for _, p in redis.flushes[0]] == [b"%d" % i for i in range(10)]
+
+    async def test_batches_are_capped_at_max_batch(self):
+        redis = FakeRedis()
+        pub = BatchedPublisher(redis, max_batch=4, linger=0.01)
+        pub.start()
+        for i in range(10):
+            pub.publish_nowait("market_data", b"x")
+        await pub.close()
+
+        assert [len(f) for f in redis.flushes] == [4, 4, 2]
+
+    async def test_full_batch_flushes_without_waiting_for_linger(self):
+        redis = FakeRedis()
+        pub = BatchedPublisher(redis, max_batch=4, linger=5.0)
+        pub.start()
+        pub.publish_nowait("execution_requests", b"a")
+        await asyncio.sleep(0)  # drain task is now lingering for more
+        for p in (b"b", b"c", b"d"):
+            pub.publish_nowait("execution_requests", p)
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert [[p for _, p in f] for f in redis.flushes] == [[b"a", b"b", b"c", b"d"]]
+        await asyncio.wait_for(pub.close(), timeout=1.0)
+
+    async def test_messages_published_before_close_are_flushed(self):
+        redis = FakeRedis()
+        pub = BatchedPublisher(redis, max_batch=64, linger=1.0)
+        pub.start()
+        pub.publish_nowait("execution_requests", b"req")
+        await asyncio.sleep(0)  # drain task is now lingering
+        await asyncio.wait_for(pub.close(), timeout=0.5)
+
+        assert redis.flushes == [[("execution_requests", b"req")]]
+
+    async def test_flush_waits_for_queued_messages_without_linger(self):
+        redis = FakeRedis()
+        pub = BatchedPublisher(redis, max_batch=64, linger=5.0)
+        pub.start()
+        pub.publish_nowait("execution_requests", b"a")
+        await asyncio.sleep(0)  # drain task is now lingering
+        pub.publish_nowait("execution_requests", b"b")
+        await asyncio.wait_for(pub.flush(), timeout=0.5)
+
+        assert redis.flushes == [[("execution_requests", b"a"), ("execution_requests", b"b")]]
+        await asyncio.wait_for(pub.close(), timeout=0.5)
+
+    async def test_flush_before_start_returns_immediately(self):
+        pub = BatchedPublisher(FakeRedis())
+        pub.publish_nowait("execution_requests", b"a")
+        await asyncio.wait_for(pub.flush(), timeout=0.5)
+
+
+# ---------------------------------------------------------------------------
+# Back-pressure
+# ---------------------------------------------------------------------------
+
+class TestBackPressure:
+    async def test_full_queue_drops_and_counts(self):
+        pub = BatchedPublisher(FakeRedis(), max_queue=2)
+        assert pub.publish_nowait("market_data", b"a")
+        assert pub.publish_nowait("market_data", b"b")
+        assert not pub.publish_nowait("market_data", b"c")
+        assert pub.dropped == 1
+
+    async def test_flush_error_does_not_stop_drain_task(self):
+        redis = MagicMock()
+        pipe = MagicMock()
+        pipe.execute = AsyncMock(side_effect=[ConnectionError("down"), None])
+        redis.pipeline.return_value = pipe
+
+        pub = BatchedPublisher(redis, max_batch=1, linger=0.0)
+        pub.start()
+        pub.publish_nowait("market_data", b"a")
+        pub.publish_nowait("market_data", b"b")
+        await pub.close()
+
+        assert pipe.execute.await_count == 2
+        assert pub.failed == 1
@@ -0,0 +1,105 @@
+"""
+Unit tests for shared/pubsub_protocol.py
+
+The risk service reads trade_signals / execution_filled through this raw
+subscriber when hiredis is installed, so parsed messages must reach the
+inbox in order, partial frames must be reassembled, and a full inbox must
+pause the socket instead of dropping messages.
+"""
+import asyncio
+
+import pytest
+
+pytest.importorskip("hiredis")
+
+from pubsub_protocol import RedisSubscriberProtocol, encode_command
+
+
+def _message(channel: bytes, data: bytes) -> bytes:
+    return (
+        b"*3\r\n$7\r\nmessage\r\n"
+        + b"$%d\r\n%s\r\n" % (len(channel), channel)
+        + b"$%d\r\n%s\r\n" % (len(data), data)
+    )
+
+
+class FakeTransport:
+    def __init__(self):
+        self.paused = False
+        self.closed = False
+
+    def pause_reading(self):
+        self.paused = True
+
+    def resume_reading(self):
+        self.paused = False
+
+    def is_closing(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+def _protocol(maxsize=0):
+    queue = asyncio.Queue(maxsize=maxsize)
+    protocol = RedisSubscriberProtocol(queue)
+    transport = FakeTransport()
+    protocol.connection_made(transport)
+    return protocol, transport, queue
+
+
+def test_encode_command():
+    assert encode_command("SUBSCRIBE", "a", b"bc") == (
+        b"*3\r\n$9\r\nSUBSCRIBE\r\n$1\r\na\r\n$2\r\nbc\r\n"
+    )
+
+
+class TestParsing:
+    async def test_subscribe_confirmations_are_ignored(self):
+        protocol, _, queue = _protocol()
+        protocol.data_received(b"*3\r\n$9\r\nsubscribe\r\n$13\r\ntrade_signals\r\n:1\r\n")
+        protocol.data_received(_message(b"trade_signals", b'{"a":1}'))
+        assert queue.qsize() == 1
+        assert queue.get_nowait() == (b"trade_signals", b'{"a":1}')
+
+    async def test_split_frames_are_reassembled(self):
+        protocol, _, queue = _protocol()
+        frame = _message(b"execution_filled", b"payload") * 2
+        for i in range(0, len(frame), 5):
+            protocol.data_received(frame[i:i + 5])
+        assert [queue.get_nowait() for _ in range(2)] == [
+            (b"execution_filled", b"payload"),
+        ] * 2
+
+    async def test_error_reply_is_skipped(self):
+        protocol, _, queue = _protocol()
+        protocol.data_received(b"-ERR boom\r\n" + _message(b"c", b"d"))
+        assert queue.get_nowait() == (b"c", b"d")
+
+
+class TestBackpressure:
+    async def test_full_queue_pauses_then_resumes_in_order(self):
+        protocol, transport, queue = _protocol(maxsize=2)
+        protocol.data_received(b"".join(_message(b"c", b"%d" % i) for i in range(5)))
+        assert transport.paused
+        assert queue.qsize() == 2
+
+        received = []
+        while len(received) < 5:
+            received.append((await queue.get())[1])
+        await asyncio.sleep(0)
+        assert received == [b"0", b"1", b"2", b"3", b"4"]
+        assert not transport.paused
+
+    async def test_wait_closed_waits_for_backlog(self):
+        protocol, _, queue = _protocol(maxsize=1)
+        protocol.data_received(_message(b"c", b"1") + _message(b"c", b"2"))
+        protocol.connection_lost(None)
+
+        waiter = asyncio.ensure_future(protocol.wait_closed())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        assert queue.get_nowait() == (b"c", b"1")
+        await waiter
+        assert queue.get_nowait() == (b"c", b"2")
@@ -0,0 +1,78 @@
+"""
+Unit tests for shared/redis_client.py
+
+Every service builds its Redis clients through create_redis(), so the
+pool tuning (size, keepalive, health checks, raw bytes responses) and the
+REDIS_HOST/REDIS_PORT URL must be applied consistently.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+import redis_client
+from redis_client import create_redis, redis_url
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Replace redis.asyncio inside redis_client; no server is contacted."""
+    fake = MagicMock()
+    monkeypatch.setattr(redis_client, "redis", fake)
+    return fake
+
+
+class TestRedisUrl:
+    def test_defaults(self, monkeypatch):
+        monkeypatch.delenv("REDIS_HOST", raising=False)
+        monkeypatch.delenv("REDIS_PORT", raising=False)
+        assert redis_url() == "redis://redis:6379"
+
+    def test_env_override(self, monkeypatch):
+        monkeypatch.setenv("REDIS_HOST", "cache")
+        monkeypatch.setenv("REDIS_PORT", "6380")
+        assert redis_url() == "redis://cache:6380"
+
+
+class TestCreateRedis:
+    def test_pool_tuning(self, fake_redis, monkeypatch):
+        monkeypatch.delenv("REDIS_MAX_CONNECTIONS", raising=False)
+        monkeypatch.delenv("REDIS_HEALTH_CHECK_INTERVAL", raising=False)
+        create_redis("redis://localhost:6379")
+
+        fake_redis.ConnectionPool.from_url.assert_called_once_with(
+            "redis://localhost:6379",
+            max_connections=32,
+            socket_keepalive=True,
+            health_check_interval=30,
+            decode_responses=False,
+        )
+
+    def test_env_overrides(self, fake_redis, monkeypatch):
+        monkeypatch.setenv("REDIS_MAX_CONNECTIONS", "4")
+        monkeypatch.setenv("REDIS_HEALTH_CHECK_INTERVAL", "0")
+        create_redis("redis://localhost:6379")
+
+        kwargs = fake_redis.ConnectionPool.from_url.call_args.kwargs
+        assert kwargs["max_connections"] == 4
+        assert kwargs["health_check_interval"] == 0
+
+    def test_client_uses_the_pool(self, fake_redis):
+        create_redis("redis://localhost:6379")
+        fake_redis.Redis.assert_called_once_with(
+            connection_pool=fake_redis.ConnectionPool.from_url.return_value
+        )
+
+    def test_socket_tuning_is_opt_in(self, fake_redis):
+        create_redis("redis://localhost:6379", recv_buffer=1 << 20, read_size=1 << 18)
+
+        kwargs = fake_redis.ConnectionPool.from_url.call_args.kwargs
+        assert kwargs["connection_class"] is redis_client._TunedConnection
+        assert kwargs["recv_buffer"] == 1 << 20
+        assert kwargs["socket_read_size"] == 1 << 18
+
+
+class TestGetRedis:
+    def test_one_client_per_process(self, fake_redis, monkeypatch):
+        monkeypatch.setattr(redis_client, "_shared_client", None)
+        first = redis_client.get_redis()
+        assert redis_client.get_redis() is first
+        fake_redis.ConnectionPool.from_url.assert_called_once()
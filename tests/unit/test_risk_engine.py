@@ -161,6 +161,13 @@ class TestResetKillSwitch:
         assert engine.starting_equity == 95_000
         assert engine.daily_pnl == 0.0
 
+    def test_drawdown_limit_follows_new_anchor(self):
+        engine = make_engine()  # 3% limit
+        engine.current_equity = 50_000
+        engine.reset_kill_switch()
+        engine.daily_pnl = -1_600  # 3.2% of the new 50k anchor
+        assert engine.check_kill_switch() is True
+
 
 # ---------------------------------------------------------------------------
 # calculate_position_size
@@ -224,6 +231,44 @@ class TestValidateSignal:
         assert engine.validate_signal({}) is False
 
 
+# ---------------------------------------------------------------------------
+# process_signal (fused gate + sizing used by the consumer loop)
+# ---------------------------------------------------------------------------
+
+class TestProcessSignal:
+    def _engine(self):
+        engine = make_engine(RISK_PER_TRADE_PCT=0.01)
+        engine.update_account_state(equity=100_000, daily_pnl=0)
+        return engine
+
+    @pytest.mark.parametrize("is_buy, stop_loss", [(True, 98.0), (False, 102.0)])
+    def test_matches_separate_calls(self, is_buy, stop_loss):
+        # risk_amount=1000, 2% stop on a 100 entry => floor(1000 / 2) = 500
+        engine = self._engine()
+        assert engine.process_signal(100.0, is_buy) == 500
+        assert engine.calculate_position_size(100.0, stop_loss) == 500
+
+    def test_zero_when_kill_switch_active(self):
+        engine = self._engine()
+        engine.is_kill_switch_active = True
+        assert engine.process_signal(100.0, True) == 0
+
+    def test_zero_in_manual_approval_mode(self):
+        engine = self._engine()
+        engine.is_manual_approval_mode = True
+        assert engine.process_signal(100.0, True) == 0
+        assert engine.is_kill_switch_active is False
+
+    def test_trips_kill_switch_on_drawdown(self):
+        engine = self._engine()
+        engine.daily_pnl = -5_000
+        assert engine.process_signal(100.0, True) == 0
+        assert engine.is_kill_switch_active is True
+
+    def test_zero_for_invalid_price(self):
+        assert self._engine().process_signal(0.0, True) == 0
+
+
 # ---------------------------------------------------------------------------
 # Rolling accuracy
 # ---------------------------------------------------------------------------
@@ -270,15 +315,29 @@ class TestRollingSharpe:
 
     def test_returns_none_when_all_returns_identical(self):
         # Zero standard deviation -> undefined Sharpe.
-        # NOTE: must use exact integer-representable values (e.g. 0.0) so that
-        # floating-point subtraction r - mean_r is exactly 0.0.  Repeating
-        # decimal constants like 0.01 accumulate rounding error and produce a
-        # non-zero (astronomically large) Sharpe — a known limitation in the
-        # current `if std_r == 0` check.
         engine = make_engine()
         _seed_predictions(engine, [True] * 10, [0.0] * 10)
         assert engine.get_rolling_sharpe() is None
 
+    def test_returns_none_when_identical_returns_are_inexact_floats(self):
+        # 0.01 is not exactly representable; rounding noise in the running
+        # variance must still be treated as zero volatility.
+        engine = make_engine()
+        _seed_predictions(engine, [True] * 10, [0.01] * 10)
+        assert engine.get_rolling_sharpe() is None
+
+    def test_matches_two_pass_sharpe_after_window_wraps(self):
+        import math
+        engine = make_engine()
+        returns = [0.001 * ((i * 7) % 11 - 5) for i in range(57)]
+        _seed_predictions(engine, [True] * len(returns), returns)
+        window = returns[-20:]
+        mean_r = sum(window) / 20
+        std_r = (sum((r - mean_r) ** 2 for r in window) / 20) ** 0.5
+        assert engine.get_rolling_sharpe() == pytest.approx(
+            (mean_r / std_r) * math.sqrt(252), abs=1e-3
+        )
+
     def test_positive_sharpe_for_consistently_positive_returns(self):
         engine = make_engine()
         # All positive, with some variance
@@ -0,0 +1,45 @@
+"""
+Unit tests for shared/serialization.py
+
+Every service publishes and consumes Redis messages through dumps()/loads(),
+so the round trip must be lossless and the output type stable (bytes)
+regardless of which JSON backend is installed.
+"""
+import json
+
+import pytest
+from serialization import JSONDecodeError, dumps, loads
+
+
+class TestDumps:
+    def test_returns_bytes(self):
+        assert isinstance(dumps({"symbol": "SPY"}), bytes)
+
+    def test_output_is_valid_json(self):
+        payload = {"symbol": "SPY", "price": 450.25, "size": 10, "type": "trade"}
+        assert json.loads(dumps(payload)) == payload
+
+
+class TestLoads:
+    @pytest.mark.parametrize("raw", [
+        b'{"price": 1.5}',
+        bytearray(b'{"price": 1.5}'),
+        '{"price": 1.5}',
+    ])
+    def test_accepts_bytes_and_str(self, raw):
+        assert loads(raw) == {"price": 1.5}
+
+    def test_round_trip(self):
+        payload = {"command": "LIQUIDATE_ALL", "explanation": ["rsi: 0.42"], "qty": 3}
+        assert loads(dumps(payload)) == payload
+
+    def test_invalid_json_raises_decode_error(self):
+        with pytest.raises(JSONDecodeError):
+            loads(b"{not json")
+
+
+class TestNumpyValues:
+    def test_numpy_scalars_and_arrays(self):
+        np = pytest.importorskip("numpy")
+        payload = {"confidence": np.float32(0.5), "qty": np.int64(3), "probs": np.array([0.25, 0.75])}
+        assert loads(dumps(payload)) == {"confidence": 0.5, "qty": 3, "probs": [0.25, 0.75]}
@@ -0,0 +1,65 @@
+"""
+Unit tests for services/signal/db.py
+
+SignalDB.fetch_ohlcv feeds bars to the ML strategies.  Rows must come back in
+chronological order, and repeated fetches within the same minute must be
+served from the in-memory cache instead of another QuestDB round trip.
+"""
+import importlib.util
+import pathlib
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+# services/gateway also ships a db.py, so load the signal module by path.
+_DB_PATH = pathlib.Path(__file__).parent.parent.parent / "services" / "signal" / "db.py"
+_spec = importlib.util.spec_from_file_location("signal_db", _DB_PATH)
+signal_db = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(signal_db)
+
+
+ROWS = [{"timestamp": 3, "close": 3.0}, {"timestamp": 2, "close": 2.0}, {"timestamp": 1, "close": 1.0}]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(signal_db.time, "time", lambda: 60 * 1000 + 5)
+    d = signal_db.SignalDB()
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=ROWS)
+    acquire = MagicMock()
+    acquire.__aenter__ = AsyncMock(return_value=conn)
+    acquire.__aexit__ = AsyncMock(return_value=False)
+    d.quest_pool = MagicMock()
+    d.quest_pool.acquire.return_value = acquire
+    d.conn = conn
+    return d
+
+
+class TestFetchOhlcv:
+    async def test_rows_are_chronological_and_limit_is_bound(self, db):
+        bars = await db.fetch_ohlcv("SPY", limit=3)
+        assert [b["timestamp"] for b in bars] == [1, 2, 3]
+        assert db.conn.fetch.await_args.args[1:] == ("SPY", 3)
+
+    async def test_same_minute_is_served_from_cache(self, db):
+        first = await db.fetch_ohlcv("SPY")
+        second = await db.fetch_ohlcv("SPY")
+        assert first == second
+        assert db.conn.fetch.await_count == 1
+
+    async def test_cache_is_keyed_by_symbol_and_limit(self, db):
+        await db.fetch_ohlcv("SPY")
+        await db.fetch_ohlcv("QQQ")
+        await db.fetch_ohlcv("SPY", limit=30)
+        assert db.conn.fetch.await_count == 3
+
+    async def test_next_minute_refetches_and_evicts(self, db, monkeypatch):
+        await db.fetch_ohlcv("SPY")
+        monkeypatch.setattr(signal_db.time, "time", lambda: 60 * 1001 + 1)
+        await db.fetch_ohlcv("SPY")
+        assert db.conn.fetch.await_count == 2
+        assert all(k[2] == 1001 for k in db._ohlcv_cache)
+
+    async def test_no_pool_returns_empty(self):
+        assert await signal_db.SignalDB().fetch_ohlcv("SPY") == []
@@ -174,3 +174,29 @@ class TestOnBar:
         s = make_strategy()
         result = run(s.on_bar({"open": 100, "high": 101, "low": 99, "close": 100, "volume": 1000}))
         assert result is None
+
+
+# ---------------------------------------------------------------------------
+# Batch replay matches the live tick path
+# ---------------------------------------------------------------------------
+
+class TestRunBatch:
+    @pytest.mark.parametrize("fast,slow", [(FAST, SLOW), (20, 50), (60, 50)])
+    async def test_matches_on_tick_signals(self, fast, slow):
+        import numpy as np
+
+        rng = np.random.default_rng(fast * slow)
+        prices = 100.0 + np.cumsum(rng.normal(0.0, 0.3, 3000))
+        prices[500:700] = prices[500]   # flat stretch: no spurious crosses
+        prices[[10, 900, 1500]] = 0.0   # rejected ticks keep alignment
+
+        live = make_strategy(fast_period=fast, slow_period=slow)
+        expected = []
+        for i, p in enumerate(prices):
+            sig = await live.on_tick({"price": float(p), "timestamp": i})
+            expected.append(0 if sig is None else (1 if sig["signal"] == "BUY" else -1))
+
+        batch = make_strategy(fast_period=fast, slow_period=slow).run_batch(prices)
+        assert batch.dtype == np.int8
+        assert batch.tolist() == expected
+        assert any(expected)
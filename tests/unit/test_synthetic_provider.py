@@ -0,0 +1,88 @@
+"""
+Unit tests for services/gateway/providers/synthetic_provider.py
+
+The synthetic provider drives the whole pipeline in dev and CI.  The GBM step
+is vectorised over all subscribed symbols, so each tick must still carry the
+right symbol, a positive 2-dp price and a size in range, and the provider's
+per-symbol price state must track the walk.
+"""
+import asyncio
+from datetime import datetime
+
+import numpy as np
+from providers.synthetic_provider import SyntheticDataProvider
+
+
+def collect_ticks(provider, symbols, rounds):
+    ticks = []
+
+    async def callback(trade):
+        ticks.append(dict(trade))
+        if len(ticks) == rounds * len(symbols):
+            provider.is_running = False
+
+    asyncio.run(provider.subscribe(symbols, callback))
+    return ticks
+
+
+class TestSubscribe:
+    def test_one_tick_per_symbol_per_round(self):
+        provider = SyntheticDataProvider()
+        symbols = ["SPY", "AAPL", "NEWCO"]
+        ticks = collect_ticks(provider, symbols, rounds=1)
+        assert [t["symbol"] for t in ticks] == symbols
+
+    def test_tick_fields(self):
+        provider = SyntheticDataProvider()
+        tick = collect_ticks(provider, ["SPY"], rounds=1)[0]
+        assert tick["type"] == "trade"
+        assert tick["provider"] == "synthetic"
+        assert tick["price"] > 0 and round(tick["price"], 2) == tick["price"]
+        assert 1 <= tick["size"] <= 100
+        assert isinstance(tick["size"], int) and isinstance(tick["timestamp"], int)
+
+    def test_trade_dict_reused_per_symbol(self):
+        provider = SyntheticDataProvider()
+        seen = []
+
+        async def callback(trade):
+            seen.append(trade)
+            if len(seen) == 4:
+                provider.is_running = False
+
+        asyncio.run(provider.subscribe(["SPY", "AAPL"], callback))
+        assert seen[0] is seen[2] and seen[1] is seen[3]
+        assert seen[0] is not seen[1]
+
+    def test_unknown_symbol_starts_at_default(self):
+        provider = SyntheticDataProvider()
+        tick = collect_ticks(provider, ["NEWCO"], rounds=1)[0]
+        assert abs(tick["price"] - 100.0) < 1.0
+
+    def test_price_state_tracks_walk(self):
+        provider = SyntheticDataProvider()
+        provider._rng = np.random.default_rng(7)
+        tick = collect_ticks(provider, ["SPY"], rounds=1)[0]
+        assert provider.get_latest_price("SPY") != 450.0
+        assert round(provider.get_latest_price("SPY"), 2) == tick["price"]
+
+
+class TestHistoricalBars:
+    def test_bar_shape(self):
+        provider = SyntheticDataProvider()
+        df = provider.get_historical_bars("SPY", datetime(2024, 1, 1), datetime(2024, 1, 10), "1Day")
+        assert len(df) == 10
+        assert (df["high"] >= df["low"]).all()
+        assert df["volume"].between(1000, 50000).all()
+
+    def test_open_is_previous_close(self):
+        provider = SyntheticDataProvider()
+        df = provider.get_historical_bars("SPY", datetime(2024, 1, 1), datetime(2024, 1, 1, 1), "1Min")
+        assert df["open"].iloc[0] == df["close"].iloc[0]
+        assert (df["open"].iloc[1:].to_numpy() == df["close"].iloc[:-1].to_numpy()).all()
+        assert (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+
+    def test_empty_range(self):
+        provider = SyntheticDataProvider()
+        df = provider.get_historical_bars("SPY", datetime(2024, 1, 2), datetime(2024, 1, 1), "1Day")
+        assert df.empty
@@ -0,0 +1,47 @@
+"""
+Unit tests for shared/tick_codec.py
+
+The gateway publishes every tick on market_data_bin with pack_tick() and the
+signal service decodes it with unpack_tick(), so the round trip must be
+lossless and produce the same dict shape as the JSON market_data message.
+"""
+import pytest
+from tick_codec import TICK_FMT, pack_tick, unpack_tick
+
+
+class TestRoundTrip:
+    @pytest.mark.parametrize("symbol", ["SPY", "BRK.B", "BTCUSD", "ABCDEFGHIJKL"])
+    def test_lossless(self, symbol):
+        payload = pack_tick(symbol, 450.25, 100, 1_700_000_000_123_456_789)
+        assert unpack_tick(payload) == {
+            "symbol": symbol,
+            "price": 450.25,
+            "size": 100,
+            "timestamp": 1_700_000_000_123_456_789,
+            "type": "trade",
+        }
+
+    def test_payload_is_compact(self):
+        assert len(pack_tick("SPY", 450.25, 100, 1)) == TICK_FMT.size + 3
+
+    def test_accepts_memoryview(self):
+        payload = memoryview(pack_tick("SPY", 1.5, 1, 2))
+        assert unpack_tick(payload)["symbol"] == "SPY"
+
+
+class TestErrors:
+    def test_truncated_payload(self):
+        with pytest.raises(ValueError):
+            unpack_tick(pack_tick("SPY", 1.5, 1, 2)[:-1])
+
+    def test_short_header(self):
+        with pytest.raises(ValueError):
+            unpack_tick(b"\x00" * 4)
+
+    def test_negative_size_rejected(self):
+        with pytest.raises(ValueError):
+            pack_tick("SPY", 1.5, -1, 2)
+
+    def test_symbol_too_long(self):
+        with pytest.raises(ValueError):
+            pack_tick("X" * 256, 1.5, 1, 2)
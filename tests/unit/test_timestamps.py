@@ -0,0 +1,59 @@
+"""
+Unit tests for services/gateway/providers/timestamps.py
+
+parse_timestamp_ns stamps every streamed trade.  A wrong value silently
+reorders ticks in QuestDB, so nanosecond precision, the whole-second cache
+and the fallback path are all verified against datetime arithmetic.
+"""
+from datetime import datetime, timezone
+
+import pytest
+from providers.timestamps import parse_timestamp_ns
+
+
+def reference_ns(year, month, day, hour, minute, second, frac_ns=0) -> int:
+    dt = datetime(year, month, day, hour, minute, second, tzinfo=timezone.utc)
+    return int(dt.timestamp()) * 1_000_000_000 + frac_ns
+
+
+class TestZuluFastPath:
+    def test_nanosecond_precision(self):
+        assert parse_timestamp_ns("2024-01-02T15:04:05.123456789Z") == reference_ns(
+            2024, 1, 2, 15, 4, 5, 123_456_789
+        )
+
+    def test_millisecond_fraction_is_right_padded(self):
+        assert parse_timestamp_ns("2021-02-22T15:51:44.208Z") == reference_ns(
+            2021, 2, 22, 15, 51, 44, 208_000_000
+        )
+
+    def test_whole_seconds(self):
+        assert parse_timestamp_ns("2024-01-02T15:04:05Z") == reference_ns(2024, 1, 2, 15, 4, 5)
+
+    def test_cache_is_refreshed_when_second_changes(self):
+        first = parse_timestamp_ns("2024-01-02T15:04:05.5Z")
+        second = parse_timestamp_ns("2024-01-02T15:04:06.5Z")
+        assert second - first == 1_000_000_000
+
+    @pytest.mark.parametrize("bad", [
+        "2024-01-02T15:04:05.12a4Z",
+        "2024-01-02T15:04:05xZ",
+        "2024-13-02T15:04:05.1Z",
+    ])
+    def test_malformed_raises_value_error(self, bad):
+        with pytest.raises(ValueError):
+            parse_timestamp_ns(bad)
+
+
+class TestFallback:
+    def test_explicit_offset(self):
+        assert parse_timestamp_ns("2024-01-02T16:04:05.250000+01:00") == reference_ns(
+            2024, 1, 2, 15, 4, 5, 250_000_000
+        )
+
+    def test_naive_is_treated_as_utc(self):
+        assert parse_timestamp_ns("2024-01-02T15:04:05") == reference_ns(2024, 1, 2, 15, 4, 5)
+
+    def test_empty_string_raises(self):
+        with pytest.raises(ValueError):
+            parse_timestamp_ns("")